@@ -0,0 +1,204 @@
+"""
+Benchmark suite for the critique report pipeline.
+Generates synthetic LMS exports with the same layout as a real lms.c130j.com download (so no student
+data is ever needed), then times each stage of critique_report and records peak memory, appending
+one JSON line per stage to a results file so scaling curves can be compared across releases.
+
+    python benchmark.py --rows 1000 10000 100000 --questions 5 50 200 --label v1.1
+"""
+"""
+Import desired modules
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import subprocess
+import tempfile
+import tracemalloc
+from datetime import datetime, timedelta
+
+import critique_report as cr
+import openpyxl
+
+"""
+Synthetic export layout.  Four preamble rows, then the header row, then data.  Columns at index
+4, 5, 6, 7, 12 and 13 are the ones critReport drops by position.
+"""
+PREAMBLE = [
+    ['Survey Results Report'],
+    ['lms.c130j.com'],
+    ['Generated for benchmarking, synthetic data only'],
+    [],
+]
+HEADER = ['First Name', 'Last Name', 'Curriculum', 'Question', 'Email', 'User Name', 'Site',
+          'Organization', 'Response Text', 'Response Comments', 'Response Date', 'Survey Name',
+          'Course ID', 'Class ID']
+CURRICULA = [
+    'C-130J Pilot Block Difference Course Block 8.1',
+    'C-130J Loadmaster Difference Course Block 8.1',
+    'C-130J Pilot Refresher',
+    'C-130J Loadmaster Refresher',
+    'C-130J Engine Ground Run',
+]
+FIXED_QUESTIONS = [
+    'Identify your crew position:',
+    'Overall, this refresher course was:',
+    'The instructor was knowledgeable in the subject matter.',
+]
+COMMENTS = ['', '', '', 'Great course.', 'Sim was down for a day.',
+            'More time on emergency procedures please.', 'Instructor & materials were excellent!']
+
+
+def synthetic_questions(n_questions):
+    extra = max(0, n_questions - len(FIXED_QUESTIONS))
+    return FIXED_QUESTIONS + [f'Question {i}: the training objectives were met.' for i in range(1, extra + 1)]
+
+
+def synthetic_rows(n_rows, n_questions, duplicate_rate=0.1, missing_curriculum_rate=0.05, seed=0):
+    rng = random.Random(seed)
+    questions = synthetic_questions(n_questions)
+    start = datetime(2025, 1, 1)
+    produced = 0
+    student = 0
+    while produced < n_rows:
+        student += 1
+        first, last = f'First{student}', f'Last{student % 997}'
+        curriculum = rng.choice(CURRICULA)
+        missing = rng.random() < missing_curriculum_rate
+        role = 'Loadmaster' if 'Loadmaster' in curriculum else 'Pilot'
+        date = (start + timedelta(days=rng.randrange(365), minutes=rng.randrange(600))).strftime('%m/%d/%Y %H:%M')
+        for question in questions:
+            if produced >= n_rows:
+                return
+            if question == FIXED_QUESTIONS[0]:
+                response = role
+            elif question == FIXED_QUESTIONS[1]:
+                response = rng.choice(['Excellent', 'Good', 'Fair', ''])
+            else:
+                response = str(rng.choices([1, 2, 3, 4, 5], weights=[1, 2, 5, 20, 40])[0])
+            row = [first, last, None if missing else curriculum, question, f'{first}@example.mil', first.lower(),
+                   'Dyess', 'JMATS', response, rng.choice(COMMENTS) or None, date, 'End of Course Critique',
+                   'C130J', f'CL{student % 50}']
+            yield row
+            produced += 1
+            # LMS exports repeat responses, often once with the curriculum and once without it
+            if rng.random() < duplicate_rate and produced < n_rows:
+                duplicate = list(row)
+                if rng.random() < 0.5:
+                    duplicate[2] = None
+                yield duplicate
+                produced += 1
+
+
+def write_synthetic_export(path, n_rows, n_questions, duplicate_rate=0.1, missing_curriculum_rate=0.05, seed=0):
+    # Write-only workbook streams rows to disk, so million-row exports do not need the sheet in memory
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet('Report')
+    for row in PREAMBLE:
+        ws.append(row)
+    ws.append(HEADER)
+    for row in synthetic_rows(n_rows, n_questions, duplicate_rate, missing_curriculum_rate, seed):
+        ws.append(row)
+    wb.save(path)
+    return path
+
+
+def synthetic_export(n_rows, n_questions, data_dir, seed=0):
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, f'synthetic_{n_rows}_{n_questions}_{seed}.xlsx')
+    if not os.path.exists(path):
+        write_synthetic_export(path, n_rows, n_questions, seed=seed)
+    return path
+
+"""
+Stage timing.  Each stage runs under tracemalloc so the recorded peak is the Python heap high-water
+mark for that stage alone.  Charts are rendered inline (chart_workers=1) by default so their memory
+is counted and timings are not skewed by pool start-up.
+"""
+def timed(stage, results, func, *args, **kwargs):
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    started = time.perf_counter()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results.append({'stage': stage, 'seconds': round(elapsed, 4), 'peak_mb': round(peak / 2 ** 20, 2)})
+
+
+def run_pipeline(path, out_dir, chart_workers=1):
+    results = []
+    crit, initial_rows, cleaned_rows = timed('critReport', results, cr.critReport, path, use_cache=False)
+    crit = timed('classify', results, cr.classify_critiques, crit)
+    totals, tbc, no_course, overall = timed('aggregate', results, cr.aggregate_critiques, crit)
+    scorecards, comments, bars = timed('question_table', results, cr.question_table, crit,
+                                       chart_workers=chart_workers, use_cache=False)
+    output_file = os.path.join(out_dir, os.path.splitext(os.path.basename(path))[0] + '.docx')
+    timed('export_to_word', results, cr.export_to_word, bars, comments, filename=output_file,
+          totals=totals, tbc=tbc, no_course=no_course, overall_comments_df=overall,
+          initial_rows=initial_rows, cleaned_rows=cleaned_rows, use_cache=False, section_workers=chart_workers)
+    return results, {'initial_rows': initial_rows, 'cleaned_rows': cleaned_rows, 'questions': len(scorecards)}
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the critique report pipeline on synthetic exports.')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help='data rows per synthetic export (default: 1000 10000 100000)')
+    parser.add_argument('--questions', type=int, nargs='+', default=[5, 50],
+                        help='questions per survey (default: 5 50)')
+    parser.add_argument('--repeat', type=int, default=1, help='runs per size (default: 1)')
+    parser.add_argument('--chart-workers', type=int, default=1,
+                        help='chart render processes (default: 1, inline)')
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'critique_bench'),
+                        help='where synthetic exports and reports are kept between runs')
+    parser.add_argument('--results', default='bench_results.jsonl',
+                        help='JSON lines file results are appended to (default: bench_results.jsonl)')
+    parser.add_argument('--label', default=None, help='release or branch label stored with each result')
+    parser.add_argument('--generate-only', action='store_true',
+                        help='only write the synthetic exports, do not run the pipeline')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    cr.load_dependencies()
+    revision = git_revision()
+    out_dir = os.path.join(args.data_dir, 'reports')
+    os.makedirs(out_dir, exist_ok=True)
+
+    for n_rows in args.rows:
+        for n_questions in args.questions:
+            path = synthetic_export(n_rows, n_questions, args.data_dir)
+            if args.generate_only:
+                print(path)
+                continue
+            for run in range(args.repeat):
+                stages, sizes = run_pipeline(path, out_dir, chart_workers=args.chart_workers)
+                record = {'timestamp': datetime.now().isoformat(timespec='seconds'), 'label': args.label,
+                          'revision': revision, 'python': platform.python_version(),
+                          'pandas': cr.pd.__version__, 'rows': n_rows, 'n_questions': n_questions,
+                          'run': run, **sizes}
+                with open(args.results, 'a', encoding='utf-8') as f:
+                    for stage in stages:
+                        f.write(json.dumps({**record, **stage}) + '\n')
+                summary = ', '.join(f"{s['stage']} {s['seconds']:.2f}s/{s['peak_mb']:.0f}MB" for s in stages)
+                print(f'{n_rows} rows x {n_questions} questions: {summary}')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,25 +13,32 @@ and uses Matplotlib for pie and bar charts.
 """
 Import desired modules
 """
+import time
+_START_TIME = time.perf_counter()  # reference point for the startup timing in run_gui
 import os
+import sys
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
-import pandas as pd
-import matplotlib.pyplot as plt
 from io import BytesIO
-import plotly.express as px
-from docx import Document
-from docx.shared import Inches, RGBColor
-from docx.oxml.ns import qn
-from docx.oxml import OxmlElement
-from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
-import openpyxl
+from xml.sax.saxutils import escape as xml_escape
+import contextlib
+import csv
+import contextvars
 import hashlib
+import importlib.util
+import json
+import tracemalloc
+import re
+import sqlite3
+import signal
 import logging
 import tkinter as tk
 from tkinter import filedialog
 from tkinter import ttk
 import threading
-import time
+import queue
 """
 Create log for error tracking, management, and analysis
 """
@@ -44,6 +51,204 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+"""
+Heavy modules are loaded by load_dependencies() rather than at import, so the GUI window opens first
+"""
+pd = openpyxl = None
+matplotlib = Figure = FigureCanvasAgg = PILImage = None
+Document = Inches = nsdecls = parse_xml = WD_PARAGRAPH_ALIGNMENT = None
+_dependencies_lock = threading.Lock()
+
+
+def load_dependencies():
+    global pd, openpyxl, matplotlib, Figure, FigureCanvasAgg, PILImage, Document, Inches, nsdecls, parse_xml, \
+        WD_PARAGRAPH_ALIGNMENT
+    with _dependencies_lock:
+        if pd is not None:
+            return
+        started = time.perf_counter()
+        import matplotlib as _matplotlib
+        from matplotlib.figure import Figure as _Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg as _FigureCanvasAgg
+        from PIL import Image as _PILImage
+        from docx import Document as _Document
+        from docx.shared import Inches as _Inches
+        from docx.oxml.ns import nsdecls as _nsdecls
+        from docx.oxml import parse_xml as _parse_xml
+        from docx.enum.text import WD_PARAGRAPH_ALIGNMENT as _WD_PARAGRAPH_ALIGNMENT
+        import openpyxl as _openpyxl
+        import pandas as _pd
+
+        matplotlib, Figure, FigureCanvasAgg, PILImage = _matplotlib, _Figure, _FigureCanvasAgg, _PILImage
+        Document, Inches, nsdecls, parse_xml = _Document, _Inches, _nsdecls, _parse_xml
+        WD_PARAGRAPH_ALIGNMENT = _WD_PARAGRAPH_ALIGNMENT
+        openpyxl = _openpyxl
+        pd = _pd  # bound last, marks loading as complete
+        logger.info(f'Dependencies loaded in {time.perf_counter() - started:.2f}s')
+
+
+if __name__ != "__main__":
+    load_dependencies()
+
+"""
+Run instrumentation, one JSON record of stage timings, row counts and memory per run appended to
+METRICS_PATH
+"""
+METRICS_PATH = 'pycritique_metrics.jsonl'
+_active_metrics = contextvars.ContextVar('critique_metrics', default=None)
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        resource = None
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return round(peak / 2 ** 20 if sys.platform == 'darwin' else peak / 1024, 1)
+    if sys.platform == 'win32':
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+                        ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                        ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                        ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t)]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        handle = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+            return round(counters.PeakWorkingSetSize / 2 ** 20, 1)
+    return None
+
+
+class RunMetrics:
+    def __init__(self, source, path=METRICS_PATH, trace_memory=False):
+        self.path = path
+        self.trace_memory = trace_memory
+        self.stages = {}
+        self.record = {'timestamp': datetime.now().isoformat(timespec='seconds'), 'source': source}
+        self._token = None
+        self._started = None
+        self._peak_at_start = None
+        self._owns_trace = False
+
+    def __enter__(self):
+        self._token = _active_metrics.set(self)
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_trace = True
+        self._peak_at_start = peak_rss_mb()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.record['total_seconds'] = round(time.perf_counter() - self._started, 4)
+        self.record['status'] = 'ok' if exc_type is None else f'error: {exc}'
+        # The OS only reports the peak over the process lifetime, so a reused process may show an earlier run's
+        peak = peak_rss_mb()
+        self.record['process_peak_rss_mb'] = peak
+        self.record['run_raised_peak'] = (None if peak is None or self._peak_at_start is None
+                                          else peak > self._peak_at_start)
+        self.record['stages'] = self.stages
+        if self._owns_trace:
+            tracemalloc.stop()
+        _active_metrics.reset(self._token)
+        if self.path:
+            try:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(self.record, default=str) + '\n')
+            except OSError as e:
+                logger.warning(f'Could not write metrics to {self.path}: {e}')
+        return False
+
+
+@contextlib.contextmanager
+def stage(name):
+    check_cancelled()  # every stage boundary is a safe point to stop
+    metrics = _active_metrics.get()
+    if metrics is None:
+        yield
+        return
+    tracing = metrics.trace_memory and tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.reset_peak()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        entry = metrics.stages.setdefault(name, {'seconds': 0.0, 'calls': 0})
+        entry['seconds'] = round(entry['seconds'] + time.perf_counter() - started, 4)
+        entry['calls'] += 1
+        if tracing:
+            peak = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 2)
+            entry['peak_traced_mb'] = max(entry.get('peak_traced_mb', 0), peak)
+
+
+def record_counts(**counts):
+    metrics = _active_metrics.get()
+    if metrics is not None:
+        metrics.record.update(counts)
+
+"""
+Progress and cancellation, reported as (percent, message, eta_seconds) and checked at stage boundaries
+"""
+PROGRESS_PHASES = {  # phase: (start %, end %)
+    'Loading export': (0, 30),
+    'Aggregating': (30, 40),
+    'Building question tables': (40, 45),
+    'Rendering charts': (45, 75),
+    'Writing report': (75, 97),
+    'Saving document': (97, 100),
+}
+_active_progress = contextvars.ContextVar('critique_progress', default=None)
+
+
+class ReportCancelled(Exception):
+    pass
+
+
+class ProgressTracker:
+    def __init__(self, callback=None, cancel_event=None):
+        self.callback = callback
+        self.cancel_event = cancel_event
+        self._token = None
+        self._started = None
+
+    def __enter__(self):
+        self._token = _active_progress.set(self)
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _active_progress.reset(self._token)
+        return False
+
+    def update(self, phase, done, total):
+        if self.callback is None:
+            return
+        start, end = PROGRESS_PHASES[phase]
+        percent = start + (end - start) * (done / total if total else 1)
+        elapsed = time.perf_counter() - self._started
+        eta = elapsed * (100 - percent) / percent if percent >= 1 else None
+        message = f'{phase} {done}/{total}' if total > 1 else phase
+        self.callback(percent, message, eta)
+
+
+def update_progress(phase, done=0, total=1):
+    tracker = _active_progress.get()
+    if tracker is not None:
+        tracker.update(phase, done, total)
+
+
+def check_cancelled():
+    tracker = _active_progress.get()
+    if tracker is not None and tracker.cancel_event is not None and tracker.cancel_event.is_set():
+        raise ReportCancelled('Report cancelled')
+
 """
 Reusable Functions
 """ 
@@ -55,44 +260,372 @@ def get_file(prompt):
     return filedialog.askopenfilename(title=prompt)
 
 
-def critReport(x):  # pulls data from lms.c13oj.com
+DROPPED_COLUMNS = {4, 5, 6, 7, 12, 13}  # positions of the export columns the report does not use
+
+
+def critReport(x, use_cache=True, diagnostics=False):  # pulls data from lms.c13oj.com
      # sets current directory to desired folder
     logger.info(f'Crit{os.getcwd()}')
-    ext = os.path.splitext(x)[1].lower()
-    engine = 'xlrd' if ext == '.xls' else 'openpyxl'
-    df = pd.read_excel(x, header=None, engine=engine)
-     
-    logger.info('Dataframe created')
-    logger.info(f'Loaded {len(df)} total records (including header/footer rows)')
-    initial_rows = len(df)
-    df =  df.drop(df.iloc[[0,1,2,3]].index)  # Drop first 4 rows
-    df.columns = df.iloc[0]  # Set headers
-    df = df.iloc[1:].reset_index(drop=True)  # Drop the header row from data
-    df.columns = df.columns.str.strip().str.replace(' ', '').str.lower()
-    cols_to_drop = list(df.columns[[4, 5, 6, 7, 12, 13]]) 
-    df = df.drop(columns=cols_to_drop)
-
-    """ 
-    Remove duplicate entries based on identity and question.  These columns were selected 
-    as primary indicators for duplicates.  
-    """
-    headcount = df.groupby(['firstname', 'lastname', 'question', 'responsedate']).size()
-    total_unique_combinations = headcount.shape[0]
-    logger.info(total_unique_combinations)
-    unique_count = df.groupby(['firstname', 'lastname'])['question'].nunique()
-    logger.info(unique_count)
-    logger.info(unique_count.shape[0])
-    df = df.sort_values(by='curriculum', ascending=False).drop_duplicates(subset=
-                                                                          ['firstname', 
-                                                                           'lastname', 
-                                                                           'question', 
-                                                                           'responsedate']).reset_index(drop=True)
-    unique_count = df.groupby(['firstname', 'lastname'])['question'].nunique()
+    key = None
+    if use_cache:
+        with stage('cache_load'):
+            key = file_digest(x)
+            cached = load_cached_critiques(key)
+        if cached is not None:
+            logger.info(f'Loaded cleaned data from cache ({key}); Excel parsing skipped.')
+            record_counts(initial_rows=cached[1], cleaned_rows=cached[2], cache_hit=True)
+            return cached
+
+    if os.path.getsize(x) >= STREAM_MIN_BYTES:
+        with stage('stream_ingest'):
+            df, initial_rows = stream_critiques(x, diagnostics=diagnostics)
+        logger.info(f'Streamed {initial_rows} total records (including header/footer rows)')
+    else:
+        with stage('ingest'):
+            ext = os.path.splitext(x)[1].lower()
+            engine = 'xlrd' if ext == '.xls' else 'openpyxl'
+            # Columns critReport never uses are skipped at read time instead of dropped afterwards
+            df = pd.read_excel(x, header=None, engine=engine, usecols=lambda col: col not in DROPPED_COLUMNS)
+
+        logger.info('Dataframe created')
+        logger.info(f'Loaded {len(df)} total records (including header/footer rows)')
+        initial_rows = len(df)
+        with stage('clean'):
+            df =  df.drop(df.iloc[[0,1,2,3]].index)  # Drop first 4 rows
+            df.columns = df.iloc[0]  # Set headers
+            df = df.iloc[1:].reset_index(drop=True)  # Drop the header row from data
+            df.columns = df.columns.str.strip().str.replace(' ', '').str.lower()
+            df = compact_columns(df)
+
+        with stage('dedup'):
+            df = dedup_critiques(df, diagnostics=diagnostics)
     cleaned_rows = len(df)
-    logger.info(unique_count.shape[0])
+    record_counts(initial_rows=initial_rows, cleaned_rows=cleaned_rows, cache_hit=False)
     logger.info('DataFrame Cleaned for Results')
     logger.info(f'Removed duplicates; {initial_rows - len(df)} rows dropped. Final: {len(df)} rows.')
+    if key is not None:
+        with stage('cache_store'):
+            store_cached_critiques(key, df, initial_rows, cleaned_rows)
     return df, initial_rows, cleaned_rows
+
+"""
+Compact in-memory columns, repetitive text as categoricals and comments as Arrow strings when available
+"""
+CATEGORICAL_COLUMNS = ['firstname', 'lastname', 'curriculum', 'question', 'responsetext']
+ARROW_STRING_COLUMNS = ['responsecomments']
+
+
+def compact_columns(df):
+    df = df.copy()
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    if importlib.util.find_spec('pyarrow') is not None:
+        for col in ARROW_STRING_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].astype('string[pyarrow]')
+    return df
+
+"""
+Streaming ingest for large exports, read row by row and cleaned in chunks of STREAM_CHUNK_ROWS,
+producing the same frame as read_excel
+"""
+STREAM_MIN_BYTES = int(os.environ.get('CRITIQUE_STREAM_MIN_BYTES', 32 * 1024 * 1024))
+STREAM_CHUNK_ROWS = 50000
+PREAMBLE_ROWS = 4
+# read_excel's default na_values, kept here rather than imported from pandas' private parser module
+NA_STRINGS = frozenset({'', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND',
+                        '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'})
+
+
+def _xlsx_rows(path):
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[0]
+        ws.reset_dimensions()  # exports often carry wrong dimensions, read every row
+        for row in ws.iter_rows(values_only=True):
+            yield row
+    finally:
+        wb.close()
+
+
+def _xls_rows(path):
+    import xlrd
+
+    book = xlrd.open_workbook(path, on_demand=True)
+    try:
+        sheet = book.sheet_by_index(0)
+        for i in range(sheet.nrows):
+            row = []
+            for cell in sheet.row(i):
+                if cell.ctype == xlrd.XL_CELL_DATE:
+                    row.append(xlrd.xldate.xldate_as_datetime(cell.value, book.datemode))
+                elif cell.ctype == xlrd.XL_CELL_BOOLEAN:
+                    row.append(bool(cell.value))
+                elif cell.ctype in (xlrd.XL_CELL_ERROR, xlrd.XL_CELL_EMPTY, xlrd.XL_CELL_BLANK):
+                    row.append(None)
+                else:
+                    row.append(cell.value)
+            yield tuple(row)
+    finally:
+        book.release_resources()
+
+
+def export_rows(path):
+    # Raw row tuples with read_excel's conversions: blanks and the default NA strings become None,
+    # whole-number floats become ints, and trailing empty rows are dropped
+    rows = _xls_rows(path) if os.path.splitext(path)[1].lower() == '.xls' else _xlsx_rows(path)
+    blank_rows = 0
+    for raw in rows:
+        row = tuple(None if (isinstance(v, str) and v in NA_STRINGS) else
+                    int(v) if isinstance(v, float) and v.is_integer() else v
+                    for v in raw)
+        if all(v is None for v in row):
+            blank_rows += 1
+            continue
+        for _ in range(blank_rows):
+            yield (None,) * len(row)
+        blank_rows = 0
+        yield row
+
+
+def concat_compact(frames):
+    # Joins compact chunks without widening categoricals back to object columns
+    columns = {}
+    for col in frames[0].columns:
+        parts = [frame[col] for frame in frames]
+        if all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+            # Index.union keeps categories sorted, which the curriculum ranking in dedup relies on
+            categories = parts[0].cat.categories
+            for part in parts[1:]:
+                categories = categories.union(part.cat.categories)
+            dtype = pd.CategoricalDtype(categories)
+            columns[col] = pd.concat([part.astype(dtype) for part in parts], ignore_index=True)
+        else:
+            columns[col] = pd.concat(parts, ignore_index=True)
+    return pd.DataFrame(columns)
+
+
+def stream_critiques(path, chunk_rows=STREAM_CHUNK_ROWS, diagnostics=False):
+    rows = export_rows(path)
+    total_rows = 0
+    names = keep = None
+    for row in rows:
+        total_rows += 1
+        if total_rows == PREAMBLE_ROWS + 1:
+            keep = [i for i in range(len(row)) if i not in DROPPED_COLUMNS]
+            names = [str(row[i]).strip().replace(' ', '').lower() for i in keep]
+            break
+
+    chunks = []
+    chunk = []
+    for row in rows:
+        total_rows += 1
+        chunk.append([row[i] if i < len(row) else None for i in keep])
+        if len(chunk) >= chunk_rows:
+            chunks.append(dedup_critiques(compact_columns(pd.DataFrame(chunk, columns=names))))
+            chunk = []
+    if chunk or not chunks:
+        # A lone chunk gets no second pass, so its dedup is the one that reports diagnostics
+        chunks.append(dedup_critiques(compact_columns(pd.DataFrame(chunk, columns=names)),
+                                      diagnostics=diagnostics and not chunks))
+    logger.info(f'Streamed {total_rows} rows from {path} in {len(chunks)} chunk(s)')
+
+    df = chunks[0] if len(chunks) == 1 else dedup_critiques(concat_compact(chunks), diagnostics=diagnostics)
+    return df.reset_index(drop=True), total_rows
+
+"""
+Quarterly consolidation, several monthly exports parsed concurrently and merged with one combined dedup
+"""
+def consolidate_exports(paths, workers=None, use_cache=True, diagnostics=False):
+    update_progress('Loading export', 0, len(paths))
+    if workers == 1 or len(paths) == 1:
+        results = []
+        for path in paths:
+            results.append(critReport(path, use_cache=use_cache, diagnostics=diagnostics))
+            update_progress('Loading export', len(results), len(paths))
+    else:
+        # Frozen builds run workers as __main__, which skips the import-time load_dependencies()
+        with ProcessPoolExecutor(max_workers=workers, initializer=load_dependencies) as pool:
+            results = []
+            for result in pool.map(critReport, paths, [use_cache] * len(paths), [diagnostics] * len(paths)):
+                results.append(result)
+                update_progress('Loading export', len(results), len(paths))
+
+    initial_rows = sum(result[1] for result in results)
+    with stage('dedup'):
+        df = dedup_critiques(concat_compact([result[0] for result in results]),
+                             diagnostics=diagnostics)
+    cleaned_rows = len(df)
+    record_counts(initial_rows=initial_rows, cleaned_rows=cleaned_rows, files=len(paths))
+    logger.info(f'Consolidated {len(paths)} exports: {initial_rows} records, {cleaned_rows} after combined dedup.')
+    return df, initial_rows, cleaned_rows
+
+""" 
+Remove duplicate entries based on identity and question.  These columns were selected 
+as primary indicators for duplicates, of each duplicate set the row with the best curriculum is kept.
+"""
+DEDUP_COLUMNS = ['firstname', 'lastname', 'question', 'responsedate']
+
+
+def dedup_critiques(df, diagnostics=False):
+    key = pd.util.hash_pandas_object(df[DEDUP_COLUMNS], index=False).to_numpy()
+    # Categorical codes follow sorted curriculum order, missing curriculum is -1
+    rank = pd.Categorical(df['curriculum']).codes
+    ranked = pd.DataFrame({'key': key, 'rank': rank})
+    best = ranked.groupby('key')['rank'].transform('max').to_numpy()
+    keep = ranked[rank == best].drop_duplicates('key').index
+
+    if diagnostics:
+        students_before = df[['firstname', 'lastname']].drop_duplicates().shape[0]
+        logger.info(f'Dedup diagnostics: {len(df)} rows, {len(keep)} unique '
+                    f'(firstname, lastname, question, responsedate) keys, '
+                    f'{len(df) - len(keep)} duplicates, {students_before} students')
+
+    return df.iloc[keep].reset_index(drop=True)
+
+"""
+On-disk Parquet cache of cleaned critique data, keyed by a hash of the export's contents
+"""
+CACHE_DIR = os.environ.get('CRITIQUE_CACHE_DIR',
+                           os.path.join(os.path.expanduser('~'), '.critique_report', 'cache'))
+CACHE_MAX_BYTES = 512 * 1024 * 1024
+CACHE_VERSION = '3'  # bump whenever critReport's cleaning changes so stale entries are never served
+
+
+def file_digest(path, chunk_size=1024 * 1024):
+    digest = hashlib.md5(CACHE_VERSION.encode('utf-8'))
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cache_paths(key, cache_dir):
+    return os.path.join(cache_dir, f'{key}.parquet'), os.path.join(cache_dir, f'{key}.json')
+
+
+def load_cached_critiques(key, cache_dir=CACHE_DIR):
+    data_path, meta_path = _cache_paths(key, cache_dir)
+    if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+        return None
+    try:
+        df = pd.read_parquet(data_path)
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except Exception as e:
+        logger.warning(f'Ignoring unreadable cache entry {key}: {e}')
+        return None
+
+    # Touch both files so eviction treats this entry as recently used; another process may have
+    # evicted them since they were read
+    with contextlib.suppress(FileNotFoundError):
+        os.utime(data_path)
+        os.utime(meta_path)
+    return df, meta['initial_rows'], meta['cleaned_rows']
+
+
+def store_cached_critiques(key, df, initial_rows, cleaned_rows, cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+    data_path, meta_path = _cache_paths(key, cache_dir)
+    # Unique temp names so parallel batch workers never see half-written entries
+    tmp_suffix = f'.{os.getpid()}.tmp'
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        df.to_parquet(data_path + tmp_suffix, index=False)
+        with open(meta_path + tmp_suffix, 'w', encoding='utf-8') as f:
+            json.dump({'initial_rows': initial_rows, 'cleaned_rows': cleaned_rows}, f)
+        os.replace(data_path + tmp_suffix, data_path)
+        os.replace(meta_path + tmp_suffix, meta_path)
+    except Exception as e:
+        logger.warning(f'Could not cache cleaned data: {e}')
+        for path in (data_path + tmp_suffix, meta_path + tmp_suffix):
+            if os.path.exists(path):
+                os.remove(path)
+        return
+    evict_cache(cache_dir, max_bytes)
+
+
+def evict_cache(cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+    # Files sharing a key (the part of the name before the first '.') are one entry.  Batch, split and
+    # watch workers share the cache, so files may disappear under a concurrent eviction at any point
+    entries = {}
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        if name.endswith('.tmp') or not os.path.isfile(path):
+            continue
+        key = name.split('.', 1)[0]
+        size, last_used, paths = entries.get(key, (0, 0, []))
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        entries[key] = (size + stat.st_size, max(last_used, stat.st_mtime), paths + [path])
+
+    total = sum(size for size, _, _ in entries.values())
+    for key, (size, _, paths) in sorted(entries.items(), key=lambda item: item[1][1]):
+        if total <= max_bytes:
+            break
+        for path in paths:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+        total -= size
+        logger.info(f'Evicted cache entry {key}')
+
+"""
+On-disk cache of rendered chart images, keyed by a hash of the chart's kind, data, size and quality
+"""
+CHART_CACHE_DIR = os.path.join(CACHE_DIR, 'charts')
+CHART_CACHE_MAX_BYTES = 128 * 1024 * 1024
+CHART_CACHE_VERSION = '3'  # bump when chart drawing changes
+
+
+def chart_cache_key(kind, *parts):
+    return safe_filename('|'.join([CHART_CACHE_VERSION, kind] + [str(part) for part in parts]))
+
+
+def read_cached_chart(key, img_format, cache_dir=CHART_CACHE_DIR):
+    path = os.path.join(cache_dir, f'{key}.{img_format}')
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+        os.utime(path)
+    except OSError:  # missing, or evicted by another process since it was read
+        return None
+    return data
+
+
+def store_cached_chart(key, img_format, data, cache_dir=CHART_CACHE_DIR):
+    path = os.path.join(cache_dir, f'{key}.{img_format}')
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f'Could not cache chart {key}: {e}')
+
+
+def read_cached_images(key, formats):
+    images = {img_format: read_cached_chart(key, img_format) for img_format in formats}
+    return images if all(data is not None for data in images.values()) else None
+
+
+def store_cached_images(key, images):
+    for img_format, data in images.items():
+        store_cached_chart(key, img_format, data)
+
+
+def cached_chart(key, render, formats=('png',), use_cache=True):
+    # Callers run evict_cache once after their last chart rather than after every miss
+    if not use_cache:
+        return render()
+    images = read_cached_images(key, formats)
+    if images is None:
+        images = render()
+        store_cached_images(key, images)
+    return images
+
 """
 Function to create tablle and set as header as 2 columns, one for logo one for text
 """
@@ -137,75 +670,152 @@ def add_comments_table(doc, df, title):
         if i < len(col_widths):
             hdr_cells[i].width = col_widths[i]
 
-    for row_idx, (_, row) in enumerate(df.iterrows()):
-        row_cells = table.add_row().cells
-        full_row_bold_red = False
+    # Scores below 3 turn the whole row red and bold with a note under the comment
+    if len(df.columns) > 2:
+        low_score = (pd.to_numeric(df.iloc[:, 2], errors='coerce') < 3).to_numpy()
+    else:
+        low_score = [False] * len(df)
+    # Alternate row shading on rows that are not highlighted
+    shaded = [not low and row_idx % 2 == 0 for row_idx, low in enumerate(low_score)]
 
-        try:
-            score_val = float(row.iloc[2])
-            if score_val < 3:
-                full_row_bold_red = True
-        except (ValueError, IndexError, TypeError):
-            pass
+    with stage('table_emission'):
+        append_table_rows(table, [df[col].to_numpy() for col in df.columns], col_widths=col_widths,
+                          highlight=low_score, shaded=shaded, note='⚠️ Score below 3')
 
-        for i, val in enumerate(row):
+"""
+Bulk table writer, appends every row of a table in one XML parse.  Cell text follows python-docx
+conventions: newlines (including CRLF) become line breaks, tabs become tabs, missing values stay blank.
+"""
+_XML_ILLEGAL = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def _run_xml(text, highlight=False):
+    props = '<w:rPr><w:b/><w:color w:val="FF0000"/></w:rPr>' if highlight else ''
+    # CRLF comments give one break rather than two; tabs become w:tab as in python-docx
+    lines = text.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+    body = '<w:br/>'.join(
+        '<w:tab/>'.join(f'<w:t xml:space="preserve">{xml_escape(part)}</w:t>' if part else ''
+                        for part in _XML_ILLEGAL.sub('', line).split('\t'))
+        for line in lines)
+    return f'<w:r>{props}{body}</w:r>'
+
+
+def append_table_rows(table, columns, col_widths=(), highlight=None, shaded=None, note=None):
+    grid_widths = [grid_col.w for grid_col in table._tbl.tblGrid.gridCol_lst]
+    widths = [col_widths[i] if i < len(col_widths) else grid_widths[i] for i in range(len(columns))]
+    tc_widths = [f'<w:tcW w:type="dxa" w:w="{width.twips}"/>' if width is not None else '' for width in widths]
+    shading = '<w:shd w:fill="F2F2F2"/>'
+    note_xml = _run_xml('\n' + note) if note else ''
+
+    rows = []
+    for row_idx, values in enumerate(zip(*columns)):
+        is_highlighted = bool(highlight[row_idx]) if highlight is not None else False
+        is_shaded = bool(shaded[row_idx]) if shaded is not None else False
+        cells = []
+        for i, val in enumerate(values):
             text = str(val) if pd.notna(val) else ''
-            para = row_cells[i].paragraphs[0]
+            runs = _run_xml(text, is_highlighted) if text or is_highlighted else ''
+            if is_highlighted and i == 0:
+                runs += note_xml
+            tc_pr = tc_widths[i] + (shading if is_shaded else '')
+            cells.append(f'<w:tc><w:tcPr>{tc_pr}</w:tcPr><w:p>{runs}</w:p></w:tc>')
+        rows.append(f'<w:tr>{"".join(cells)}</w:tr>')
 
-            if full_row_bold_red:
-                if i == 0:
-                    # Main comment in red + bold
-                    main_run = para.add_run(text)
-                    main_run.bold = True
-                    main_run.font.color.rgb = RGBColor(255, 0, 0)
+    if rows:
+        fragment = parse_xml(f'<w:tbl {nsdecls("w")}>{"".join(rows)}</w:tbl>')
+        table._tbl.extend(list(fragment))
+
+"""
+Chart canvases, drawn on reusable Agg figures without pyplot so no figure outlives its chart
+"""
+_canvas_state = threading.local()
 
-                    # Append normal warning note
-                    note_run = para.add_run('\n⚠️ Score below 3')
-                else:
-                    run = para.add_run(text)
-                    run.bold = True
-                    run.font.color.rgb = RGBColor(255, 0, 0)
-            else:
-                run = para.add_run(text)
-
-            if i < len(col_widths):
-                row_cells[i].width = col_widths[i]
-
-        # Alternate row shading
-        if not full_row_bold_red and row_idx % 2 == 0:
-            shading_elm = OxmlElement('w:shd')
-            shading_elm.set(qn('w:fill'), 'F2F2F2')
-            for cell in row_cells:
-                cell._tc.get_or_add_tcPr().append(shading_elm)
+
+def chart_figure(width, height, dpi=100):
+    figures = getattr(_canvas_state, 'figures', None)
+    if figures is None:
+        figures = _canvas_state.figures = {}
+    fig = figures.get((width, height, dpi))
+    if fig is None:
+        fig = Figure(figsize=(width, height), dpi=dpi)
+        FigureCanvasAgg(fig)
+        figures[(width, height, dpi)] = fig
+    fig.clear()
+    return fig
+
+
+"""
+Image quality presets for the embedded charts, 'print' adds an SVG copy to the PNG
+"""
+IMAGE_QUALITIES = {
+    'draft': {'dpi': 72, 'colors': 64, 'vector': False},
+    'standard': {'dpi': 100, 'colors': 256, 'vector': False},
+    'print': {'dpi': 200, 'colors': None, 'vector': True},
+}
+DEFAULT_IMAGE_QUALITY = 'standard'
+
+
+def chart_formats(quality=DEFAULT_IMAGE_QUALITY):
+    return ('png', 'svg') if IMAGE_QUALITIES[quality]['vector'] else ('png',)
+
+
+def encode_png(fig, quality=DEFAULT_IMAGE_QUALITY):
+    preset = IMAGE_QUALITIES[quality]
+    buf = BytesIO()
+    if preset['colors'] is None:
+        fig.savefig(buf, format='png', dpi=preset['dpi'], bbox_inches='tight', pil_kwargs={'optimize': True})
+        return buf.getvalue()
+    # Rendered at the fastest zlib level, then quantized and optimized once by Pillow
+    fig.savefig(buf, format='png', dpi=preset['dpi'], bbox_inches='tight', pil_kwargs={'compress_level': 1})
+    with PILImage.open(BytesIO(buf.getvalue())) as image:
+        paletted = image.convert('RGB').quantize(colors=preset['colors'], method=PILImage.Quantize.FASTOCTREE)
+    out = BytesIO()
+    paletted.save(out, format='PNG', optimize=True)
+    return out.getvalue()
+
+
+def figure_images(fig, quality=DEFAULT_IMAGE_QUALITY):
+    images = {'png': encode_png(fig, quality)}
+    if IMAGE_QUALITIES[quality]['vector']:
+        buf = BytesIO()
+        # Fixed id salt and no date, so identical charts encode to identical bytes and share a part
+        with matplotlib.rc_context({'svg.hashsalt': 'critique_report'}):
+            fig.savefig(buf, format='svg', bbox_inches='tight', metadata={'Date': None})
+        images['svg'] = buf.getvalue()
+    fig.clear()  # release artists until the figure is reused
+    return images
 
 """ 
 Creates bar graph for each question, color coded based off score
 """
 
 
-def crit_bar(scorecard_df, question_title, img_format="png", width=800, height=600, scale=1):
-    # Define custom colors for scores 1 through 5
-    custom_colors = {
-        "1": 'red',
-        "2": 'yellow',
-        "3": '#b7ff0f',
-        "4": '#58f15f',
-        "5": '#00d146'
-    }
+# Custom colors for scores 1 through 5, shared with the GUI preview thumbnails
+SCORE_COLORS = {
+    "1": 'red',
+    "2": 'yellow',
+    "3": '#b7ff0f',
+    "4": '#58f15f',
+    "5": '#00d146'
+}
+
+
+def crit_bar(scorecard_df, question_title, quality=DEFAULT_IMAGE_QUALITY, width=800, height=600, scale=1):
 
     # Set up figure size in inches (width, height), converted from pixels
     dpi = 100
     fig_width = width / dpi
     fig_height = height / dpi
 
-    fig, ax = plt.subplots(figsize=(fig_width, fig_height), dpi=dpi)
+    fig = chart_figure(fig_width, fig_height, dpi=dpi)
+    ax = fig.add_subplot()
 
     # Get data
     x = scorecard_df['ResponseText'].astype(str)
     y = scorecard_df['Frequency']
 
     # Assign colors using the custom map
-    bar_colors = [custom_colors.get(val, 'gray') for val in x]
+    bar_colors = [SCORE_COLORS.get(val, 'gray') for val in x]
 
     # Create bar chart
     bars = ax.bar(x, y, color=bar_colors)
@@ -222,62 +832,190 @@ def crit_bar(scorecard_df, question_title, img_format="png", width=800, height=6
     ax.set_ylabel("Count")
     ax.set_ylim(0, max(y) * 1.2)  # Add some padding on Y-axis
 
-    plt.tight_layout()
+    fig.tight_layout()
 
-    # Save to in-memory buffer
-    buf = BytesIO()
-    fig.savefig(buf, format=img_format, bbox_inches='tight')
-    buf.seek(0)
+    # Encoded images only, the figure stays with this thread for reuse
+    return figure_images(fig, quality)
+
+
+"""
+Creates pie chart of students by crew position for the Student Overview page
+"""
+def student_overview_chart(totals, quality=DEFAULT_IMAGE_QUALITY):
+    data = totals.T
+    data.columns = ['Count']
+
+    labels = data.index.tolist()
+    counts = data['Count'].tolist()
+    colors = matplotlib.colormaps['Set3'].colors[:len(counts)]  # Limit colors to number of slices
+
+    fig = chart_figure(6, 6)
+    ax = fig.add_subplot()
+    wedges, texts, autotexts = ax.pie(counts,
+                                      labels=None,
+                                      autopct='%1.1f%%',
+                                      startangle=90,
+                                      colors=colors)
+
+    legend_labels = [f"{label} ({count})" for label, count in zip(labels, counts)]
+    ax.legend(wedges, legend_labels, title="Categories",
+              loc="center left", bbox_to_anchor=(1, 0.5))
+
+    ax.set_title('Critique Summary - Student Overview', fontsize=14)
+    fig.tight_layout()
+    return figure_images(fig, quality)
+
+
+"""
+Creates bar chart of students per course for the Course Overview page
+"""
+def course_overview_chart(tbc, quality=DEFAULT_IMAGE_QUALITY):
+    data2 = tbc.T
+    data2.columns = ['Count']
+
+    fig = chart_figure(10, 6)
+    ax = fig.add_subplot()
+    ax.bar([str(label) for label in data2.index], data2['Count'], width=0.5, color='darkgreen')
+    ax.set_title('Critique Summary - Course Overview', fontsize=14)
+    ax.set_ylabel('Number of Students')
+    ax.set_xlabel('')
 
-    return fig, buf
+    for label in ax.get_xticklabels():
+        label.set_rotation(45)
+        label.set_horizontalalignment('right')
+    for i, count in enumerate(data2['Count']):
+        ax.text(i, count + 0.5, str(count), ha='center', va='bottom', fontsize=9)
+
+    fig.tight_layout()
+    return figure_images(fig, quality)
+
+
+"""
+Renders every question's bar chart to encoded images, {format: bytes}, in scorecard order
+"""
+CHART_POOL_MIN_MISSES = 40  # a spawned worker's imports cost about as much as a dozen charts
+
+
+def _render_bar_chart(job):
+    load_dependencies()
+    question_title, scorecard_df, quality = job
+    return crit_bar(scorecard_df, question_title, quality)
+
+
+def bar_chart_key(question_title, scorecard_df, quality=DEFAULT_IMAGE_QUALITY, width=800, height=600, scale=1):
+    frequencies = tuple(int(v) for v in scorecard_df['Frequency'])
+    return chart_cache_key('bar', question_title, list(scorecard_df['ResponseText'].astype(str)),
+                           frequencies, quality, width, height, scale)
+
+
+def render_bar_charts(scorecards, workers=None, use_cache=True, quality=DEFAULT_IMAGE_QUALITY):
+    formats = chart_formats(quality)
+    images = {}
+    misses = []
+    for question, scorecard_df in scorecards.items():
+        cached = read_cached_images(bar_chart_key(question, scorecard_df, quality), formats) if use_cache else None
+        if cached is not None:
+            images[question] = cached
+        else:
+            misses.append((question, scorecard_df, quality))
+
+    # Only charts not already on disk go through Matplotlib
+    total = len(scorecards)
+    rendered = []
+    update_progress('Rendering charts', len(images), total)
+    if workers == 1 or len(misses) < CHART_POOL_MIN_MISSES:
+        for job in misses:
+            check_cancelled()
+            rendered.append(_render_bar_chart(job))
+            update_progress('Rendering charts', len(images) + len(rendered), total)
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        try:
+            for image in pool.map(_render_bar_chart, misses):
+                rendered.append(image)
+                update_progress('Rendering charts', len(images) + len(rendered), total)
+                check_cancelled()
+        except BaseException:
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        pool.shutdown()
+
+    for (question, scorecard_df, _), image in zip(misses, rendered):
+        images[question] = image
+        if use_cache:
+            store_cached_images(bar_chart_key(question, scorecard_df, quality), image)
+    if use_cache and misses:
+        evict_cache(CHART_CACHE_DIR, CHART_CACHE_MAX_BYTES)
+    logger.info(f'Bar charts: {len(scorecards) - len(misses)} from cache, {len(misses)} rendered.')
+    record_counts(charts_rendered=len(misses), charts_cached=len(scorecards) - len(misses))
+
+    return {question: images[question] for question in scorecards}
 
 
 """"
 Creates panda series pulling data for each specific question, turns into df for future use.
 Used with add_comments_table and crit_bar
 """
-def question_table(crit): 
+ALL_SCORES = ["1", "2", "3", "4", "5"]
+
+
+def scored_questions(crit):
     questions = crit['question'].dropna().astype(str).unique()
-    questions = [q for q in questions if q not in [
+    return [q for q in questions if q not in [
     'Identify your crew position:', 
     'Overall, this refresher course was:']] # consolidated one line iteration and removal based on condition
-    
-    
-    scorecard_results = {}
-    comment_results = {}
-    bar_chart_results = {}
-    
-    for q in questions: 
-        question_df = crit[crit['question'] == q]
-        all_scores = ["1", "2", "3", "4", "5"]
-
-        # Scorecard
-        scorecard_raw = question_df['responsetext'].value_counts()
-        scorecard = scorecard_raw.reindex(all_scores, fill_value=0).reset_index()
-        scorecard.columns = ['ResponseText', 'Frequency']
-        scorecard_results[q] = scorecard
-
-        # Comments
-        comments_df = pd.DataFrame({
-            'Comments': question_df['responsecomments'],
-            'Curriculum': question_df['curriculum'],
-            'Score': question_df['responsetext']
-        })
-        last_row = pd.DataFrame([{'Comments': 'LastEntry', 'Curriculum': None, 'Score': None}])
-        comments_df = pd.concat([comments_df, last_row], ignore_index=True)
-        comments_df = comments_df[comments_df['Comments'].notna()]
-        comments_df = comments_df[comments_df['Comments'].str.strip() != ""]
-        # Convert Score to numeric for proper sorting (NaNs are pushed last)
-        comments_df['Score'] = pd.to_numeric(comments_df['Score'], errors='coerce')
-        comments_df = comments_df.sort_values(by='Score', na_position='last')
-        comment_results[q] = comments_df
-        
 
-        # Bar Chart
-        bar_charts = crit_bar(scorecard, q)
-        bar_chart_results[q] = bar_charts
 
-        
+def score_counts(question_rows, questions):
+    # Question x score counts in a single crosstab, one row per question in report order
+    counts = pd.crosstab(question_rows['question'], question_rows['responsetext'])
+    return counts.reindex(index=questions, columns=ALL_SCORES, fill_value=0)
+
+
+def question_table(crit, chart_workers=None, use_cache=True, charts=True, image_quality=DEFAULT_IMAGE_QUALITY):
+    questions = scored_questions(crit)
+    all_scores = ALL_SCORES
+
+    with stage('question_tables'):
+        # One pass over the frame for every question instead of a boolean mask per question
+        question_rows = crit[crit['question'].isin(questions)]
+
+        # Scorecards
+        counts = score_counts(question_rows, questions)
+        scorecard_results = {
+            q: pd.DataFrame({'ResponseText': all_scores, 'Frequency': counts.loc[q].to_numpy()})
+            for q in questions
+        }
+
+        # Comments, extracted and sorted once then split by question.  Each question keeps its
+        # trailing 'LastEntry' row, added here as one block rather than a concat per question
+        comments = pd.DataFrame({
+            'question': question_rows['question'],
+            'Comments': question_rows['responsecomments'],
+            'Curriculum': question_rows['curriculum'],
+            'Score': question_rows['responsetext']
+        })
+        comments = comments[comments['Comments'].notna()]
+        comments = comments[comments['Comments'].astype(str).str.strip() != ""]
+        last_rows = pd.DataFrame({'question': questions, 'Comments': 'LastEntry', 'Curriculum': None, 'Score': None})
+        comments = pd.concat([comments, last_rows], ignore_index=True)
+        # Convert Score to numeric for proper sorting (NaNs are pushed last); stable so ties keep response order
+        comments['Score'] = pd.to_numeric(comments['Score'], errors='coerce')
+        comments = comments.sort_values(by='Score', na_position='last', kind='stable')
+        grouped = dict(tuple(comments.groupby('question', sort=False)))
+        comment_results = {
+            q: grouped[q].drop(columns='question').reset_index(drop=True)
+            for q in questions
+        }
+    record_counts(questions=len(questions), comments=len(comments) - len(questions))
+
+    # Bar Charts, rendered together so rasterization can be spread across worker processes
+    bar_chart_results = {}
+    if charts:
+        with stage('chart_rendering'):
+            bar_chart_results = render_bar_charts(scorecard_results, workers=chart_workers, use_cache=use_cache,
+                                                  quality=image_quality)
+
     return scorecard_results, comment_results, bar_chart_results
 
 """
@@ -301,27 +1039,122 @@ def add_unknown_course_table(doc, df, title='Unknown Course Entries'):
     for i, col in enumerate(cols):
         hdr_cells[i].text = col.capitalize()
 
-    for _, row in df.iterrows():
-        row_cells = table.add_row().cells
-        for i, col in enumerate(cols):
-            row_cells[i].text = str(row[col]) if pd.notna(row[col]) else ""
+    with stage('table_emission'):
+        append_table_rows(table, [df[col].to_numpy() for col in cols])
+"""
+Creates a count table with one row per month, used for the per-month overview breakdowns
+"""
+def add_breakdown_table(doc, df, title):
+    doc.add_heading(title, level=2)
+    cols = [df.index.name or ''] + [str(col) for col in df.columns]
+    table = doc.add_table(rows=1, cols=len(cols))
+    table.style = 'Table Grid'
+
+    hdr_cells = table.rows[0].cells
+    for i, col in enumerate(cols):
+        hdr_cells[i].text = col
+
+    with stage('table_emission'):
+        append_table_rows(table, [df.index.to_numpy()] + [df[col].to_numpy() for col in df.columns])
 """
 Creates safe virtial name, ensuring appropriate size and characters
 """
 def safe_filename(text):
     return hashlib.md5(text.encode('utf-8')).hexdigest()
 """
+Adds a chart to the document from its encoded images, with any SVG copy attached through svgBlip
+"""
+SVG_BLIP_URI = '{96DAC541-7B7A-43D3-8B79-37D633B846F1}'
+SVG_NAMESPACE = 'http://schemas.microsoft.com/office/drawing/2016/SVG/main'
+
+
+def svg_part_rid(document_part, svg):
+    from docx.opc.part import Part
+    from docx.opc.constants import RELATIONSHIP_TYPE as RT
+
+    for rel in document_part.rels.values():
+        if not rel.is_external and rel.target_part.content_type == 'image/svg+xml' and rel.target_part.blob == svg:
+            return rel.rId
+    package = document_part.package
+    part = Part(package.next_partname('/word/media/vector%d.svg'), 'image/svg+xml', svg, package)
+    return document_part.relate_to(part, RT.IMAGE)
+
+
+def add_chart_picture(doc, images, width):
+    shape = doc.add_picture(BytesIO(images['png']), width=width)
+    if 'svg' in images:
+        rid = svg_part_rid(doc.part, images['svg'])
+        blip = shape._inline.xpath('.//a:blip')[0]
+        blip.append(parse_xml(f'<a:extLst {nsdecls("a", "r")}><a:ext uri="{SVG_BLIP_URI}">'
+                              f'<asvg:svgBlip xmlns:asvg="{SVG_NAMESPACE}" r:embed="{rid}"/></a:ext></a:extLst>'))
+    return shape
+
+"""
+Per-question sections: page break, heading, chart and comments table, built in worker processes on
+comment-heavy reports
+"""
+SECTION_POOL_MIN_ROWS = 5000
+
+
+def section_comments(comment_tables, question):
+    if question not in comment_tables:
+        return None
+    df = comment_tables[question].copy()
+    df = df.dropna(how='all')
+    return df[~(df == '').all(axis=1)]
+
+
+def add_question_heading(doc, question):
+    doc.add_page_break()
+    question_title = str(question) if pd.notna(question) else 'Unknown Question'
+    doc.add_heading(question_title, level=1)
+
+
+def _body_xml(doc):
+    from lxml import etree
+
+    body = doc.element.body
+    return [etree.tostring(element, encoding='unicode') for element in body if element is not body.sectPr]
+
+
+def _section_fragment(job):
+    # (heading XML, comments table XML) for one question; the chart goes between them
+    load_dependencies()
+    question, comments = job
+    doc = Document()
+    add_question_heading(doc, question)
+    heading = _body_xml(doc)
+    if comments is not None:
+        add_comments_table(doc, comments, 'Comments')
+    return heading, _body_xml(doc)[len(heading):]
+
+
+def append_fragment(doc, fragment):
+    body = doc.element.body
+    for xml in fragment:
+        body.sectPr.addprevious(parse_xml(xml))
+
+"""
 Culminates all functions into one, reusable functtion compiles all charts and figures into 
 monthly/quarterly report
 """    
 def export_to_word(bar_charts, comment_tables, filename= None,
                    totals=None, tbc=None, no_course=None, overall_comments_df=None,
-                   initial_rows=None, cleaned_rows=None, du=None, month = None):
+                   initial_rows=None, cleaned_rows=None, du=None, month = None, use_cache=True,
+                   monthly_totals=None, monthly_tbc=None, image_quality=DEFAULT_IMAGE_QUALITY,
+                   section_workers=None, course_code=None, export_rows=None):
     doc = Document()
         # Add logo at title top
     script_dir = os.path.dirname(os.path.abspath(__file__))
     logo_path = os.path.join(script_dir, 'Nova.png')
-    add_logo_and_title(doc, logo_path, 'Critique Results\nJMATS Training')
+    heading = 'Critique Results' if course_code is None else f'Critique Results - {course_code}'
+    add_logo_and_title(doc, logo_path, f'{heading}\nJMATS Training')
+    # A per-course report counts only that course's rows, raw duplicates cannot be attributed to a course
+    if course_code is None:
+        record_sizes = f'Initial Record Size: {initial_rows}\nCleaned Record Size: {cleaned_rows}\n'
+    else:
+        record_sizes = (f'Course: {course_code}\n'
+                        f'Course Record Size: {cleaned_rows} of {export_rows} cleaned records in the export\n')
 
     doc.add_paragraph (f'This report is consolidated data from lms.c130j.com. It provides monthly or quarterly'
                        f'insight to interested parties (instructors, leadership, or government) to enhance and'
@@ -330,79 +1163,42 @@ def export_to_word(bar_charts, comment_tables, filename= None,
                        f'exceptions were cleared, and then centralized as a clean data set.\n'
                        f' '
                        f'Data was downloaded on: {datetime.now().date()}\n'
-                       f'Initial Record Size: {initial_rows}\n'
-                       f'Cleaned Record Size: {cleaned_rows}\n'
+                       f'{record_sizes}'
                        f'Questions or clarifications may be referred to Site Lead/Training')
    # ===== First Page: Student Overview =====
-    if totals is not None and no_course is not None:
-        pie_image = 'student_summary.png'
-        data = totals.T
-        data.columns = ['Count']
-
-        labels = data.index.tolist()
-        counts = data['Count'].tolist()
-        colors = plt.cm.Set3.colors[:len(counts)]  # Limit colors to number of slices
-
-        fig, ax = plt.subplots(figsize=(6, 6))
-        wedges, texts, autotexts = ax.pie(counts,
-                                          labels=None,
-                                          autopct='%1.1f%%',
-                                          startangle=90,
-                                          colors=colors)
-
-        legend_labels = [f"{label} ({count})" for label, count in zip(labels, counts)]
-        ax.legend(wedges, legend_labels, title="Categories",
-                  loc="center left", bbox_to_anchor=(1, 0.5))
-
-        ax.set_title('Critique Summary - Student Overview', fontsize=14)
-        plt.tight_layout()
-
-        # Save figure to an in-memory buffer
-        buffer = BytesIO()
-        fig.savefig(buffer, format='png', bbox_inches='tight')
-        buffer.seek(0)
+    if totals is not None and no_course is not None and int(totals.to_numpy().sum()) == 0:
+        doc.add_heading('Student Overview', level=1)
+        doc.add_paragraph('No student headcount responses in this data, so there is no student chart.')
+        if monthly_totals is not None:
+            add_breakdown_table(doc, monthly_totals, 'Students by Month')
+    elif totals is not None and no_course is not None:
+        student_key = chart_cache_key('student_overview', totals.to_dict('records'), image_quality)
+        with stage('overview_charts'):
+            images = cached_chart(student_key, lambda: student_overview_chart(totals, image_quality),
+                                  formats=chart_formats(image_quality), use_cache=use_cache)
 
         # Insert directly into your Word document
         doc.add_heading('Student Overview', level=1)
         doc.add_paragraph('This data is pulled directly from LMS.')
-        doc.add_picture(buffer, width=Inches(6.5))
-
-        # Cleanup
-        buffer.close()
-        plt.close(fig)
-
-
-
+        add_chart_picture(doc, images, width=Inches(6.5))
+        if monthly_totals is not None:
+            add_breakdown_table(doc, monthly_totals, 'Students by Month')
 
     # ===== Course Overview =====
 
-
     if tbc is not None and no_course is not None:
-        data2 = tbc.T
-        data2.columns = ['Count']
-
-        fig, ax = plt.subplots(figsize=(10, 6))
-        data2.plot(kind='bar', legend=False, ax=ax, color='darkgreen')
-        ax.set_title('Critique Summary - Course Overview', fontsize=14)
-        ax.set_ylabel('Number of Students')
-        ax.set_xlabel('')
-
-        plt.xticks(rotation=45, ha='right')
-        for i, count in enumerate(data2['Count']):
-            ax.text(i, count + 0.5, str(count), ha='center', va='bottom', fontsize=9)
-
-        plt.tight_layout()
-
-        # Save to buffer instead of disk
-        buffer = BytesIO()
-        fig.savefig(buffer, format='png', bbox_inches='tight')
-        buffer.seek(0)
-        plt.close(fig)
+        course_key = chart_cache_key('course_overview', tbc.to_dict('records'), image_quality)
+        with stage('overview_charts'):
+            images = cached_chart(course_key, lambda: course_overview_chart(tbc, image_quality),
+                                  formats=chart_formats(image_quality), use_cache=use_cache)
 
         doc.add_heading('Course Overview', level=1)
-        doc.add_picture(buffer, width=Inches(6.5))
+        add_chart_picture(doc, images, width=Inches(6.5))
+        if monthly_tbc is not None:
+            add_breakdown_table(doc, monthly_tbc, 'Courses by Month')
 
-        buffer.close()
+    if use_cache and os.path.isdir(CHART_CACHE_DIR):
+        evict_cache(CHART_CACHE_DIR, CHART_CACHE_MAX_BYTES)
 
     # Add the unknown course table here
     add_unknown_course_table(doc, no_course)
@@ -417,50 +1213,809 @@ def export_to_word(bar_charts, comment_tables, filename= None,
         add_comments_table(doc, overall, 'Overall, this refresher course was:')
 
     # ===== Bar Charts and Comment Tables by Question =====
-    for question in bar_charts.keys():
-        doc.add_page_break()
-        question_title = str(question) if pd.notna(question) else 'Unknown Question'
-        doc.add_heading(question_title, level=1)
-
-        fig, buf = bar_charts[question]  # from your updated crit_bar   
-        doc.add_picture(buf, width=Inches(6))
-        buf.close()
-        
-
-        # Add comments
-        if question in comment_tables:
-            df = comment_tables[question].copy()
-            df = df.dropna(how='all')
-            df = df[~(df == '').all(axis=1)]
-            add_comments_table(doc, df, 'Comments')
+    sections = [(question, section_comments(comment_tables, question)) for question in bar_charts]
+    comment_rows = sum(len(comments) for _, comments in sections if comments is not None)
+    if section_workers == 1 or len(sections) <= 1 or comment_rows < SECTION_POOL_MIN_ROWS:
+        for done, (question, comments) in enumerate(sections):
+            update_progress('Writing report', done, len(sections))
+            check_cancelled()
+            add_question_heading(doc, question)
+            add_chart_picture(doc, bar_charts[question], width=Inches(6))  # images from render_bar_charts
+            if comments is not None:
+                add_comments_table(doc, comments, 'Comments')
+    else:
+        update_progress('Writing report', 0, len(sections))
+        pool = ProcessPoolExecutor(max_workers=section_workers)
+        try:
+            fragments = pool.map(_section_fragment, sections)
+            for done, ((question, _), (heading, tables)) in enumerate(zip(sections, fragments)):
+                with stage('section_merge'):
+                    append_fragment(doc, heading)
+                    add_chart_picture(doc, bar_charts[question], width=Inches(6))
+                    append_fragment(doc, tables)
+                update_progress('Writing report', done + 1, len(sections))
+                check_cancelled()
+        except BaseException:
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        pool.shutdown()
 
     # ===== Save Document =====
-    doc.save(filename)
+    update_progress('Saving document')
+    with stage('doc_save'):
+        doc.save(filename)
     logger.info(f'Exported to {filename}')
 
+"""
+Machine-readable export of the report data for dashboards, streamed to an xlsx sheet or CSV per table
+"""
+def data_output_path(output_file, data_format):
+    return f'{os.path.splitext(output_file)[0]}_data.{data_format}'
+
+
+def _data_value(value):
+    if pd.isna(value):
+        return None
+    if isinstance(value, str):
+        return _XML_ILLEGAL.sub('', value)
+    return value.item() if hasattr(value, 'item') else value
+
+
+def _frame_rows(df, index=False):
+    columns = ([df.index.to_numpy()] if index else []) + [df[col].to_numpy() for col in df.columns]
+    return ([_data_value(v) for v in values] for values in zip(*columns))
+
+
+def data_tables(scorecards, comments, totals, tbc, no_course, overall_comments_df,
+                monthly_totals=None, monthly_tbc=None):
+    yield ('Scorecards', ['Question', 'Score', 'Frequency'],
+           ([q, score, int(freq)] for q, sc in scorecards.items()
+            for score, freq in zip(sc['ResponseText'], sc['Frequency'])))
+    yield 'Totals', list(totals.columns), _frame_rows(totals)
+    yield 'Totals by Course', list(tbc.columns), _frame_rows(tbc)
+    if monthly_totals is not None:
+        yield 'Students by Month', ['Month'] + list(monthly_totals.columns), _frame_rows(monthly_totals, index=True)
+    if monthly_tbc is not None:
+        yield 'Courses by Month', ['Month'] + [str(c) for c in monthly_tbc.columns], _frame_rows(monthly_tbc, index=True)
+    # The 'LastEntry' rows only exist to close the Word tables, so they are left out here
+    yield ('Comments', ['Question', 'Comments', 'Curriculum', 'Score'],
+           ([q] + row for q, df in comments.items()
+            for row in _frame_rows(df[['Comments', 'Curriculum', 'Score']])
+            if not (row[0] == 'LastEntry' and row[2] is None)))
+    yield 'Overall Comments', ['Comments', 'Curriculum'], _frame_rows(overall_comments_df)
+    yield 'No Course', ['firstname', 'lastname', 'responsetext'], _frame_rows(
+        no_course[['firstname', 'lastname', 'responsetext']])
+
+
+def export_data(path, scorecards, comments, totals, tbc, no_course, overall_comments_df,
+                monthly_totals=None, monthly_tbc=None):
+    tables = data_tables(scorecards, comments, totals, tbc, no_course, overall_comments_df,
+                         monthly_totals, monthly_tbc)
+    with stage('data_export'):
+        if path.lower().endswith('.csv'):
+            stem = path[:-4]
+            for name, header, rows in tables:
+                table_path = f"{stem}_{name.lower().replace(' ', '_')}.csv"
+                with open(table_path, 'w', newline='', encoding='utf-8-sig') as f:
+                    writer = csv.writer(f)
+                    writer.writerow(header)
+                    writer.writerows(rows)
+        else:
+            wb = openpyxl.Workbook(write_only=True)
+            for name, header, rows in tables:
+                ws = wb.create_sheet(name)
+                ws.append(header)
+                for row in rows:
+                    ws.append(row)
+            wb.save(path)
+    logger.info(f'Exported data to {path}')
+    return path
+
+"""
+Course and crew-role classification by regex, configurable with --patterns or CRITIQUE_PATTERNS
+"""
+PATTERNS_PATH = os.environ.get('CRITIQUE_PATTERNS')
+COURSE_PATTERNS = {
+    'PDC': r'pilot block difference.*block 8.1',
+    'LDC': r'loadmaster.*block 8.1',
+    'PSR': r'C-130J Pilot Refresher',
+    'LRT': r'loadmaster refresher',
+    'MX': r'engine ground',
+}
+UNKNOWN_COURSE = 'Unknown'
+COURSE_CODES = list(COURSE_PATTERNS) + [UNKNOWN_COURSE]
+
+QUESTION_PATTERNS = {
+    'headcount': r'knowledgeable',  # asked once per student per course, used to count students
+    'overall': r'overall',
+    'identify': r'identify',
+}
+
+ROLE_RESPONSES = {'Pilot': 'Pilots', 'Loadmaster': 'Loadmasters'}  # crew position answer -> role
+# Students of this course give no crew position answer and are counted on the headcount question instead;
+# the excluded roles' answers in it are not counted, those students already count through their own course
+HEADCOUNT_COURSE = 'MX'
+HEADCOUNT_ROLE = 'MX'
+HEADCOUNT_EXCLUDED = ['Loadmasters']
+
+
+def role_names():
+    return list(dict.fromkeys([*ROLE_RESPONSES.values(), HEADCOUNT_ROLE]))
+
+
+ROLES = role_names()
+
+
+def compile_patterns(patterns):
+    return [(label, re.compile(pattern, re.IGNORECASE)) for label, pattern in patterns.items()]
+
+
+COURSE_CLASSIFIER = compile_patterns(COURSE_PATTERNS)
+QUESTION_CLASSIFIER = compile_patterns(QUESTION_PATTERNS)
+
+
+def configure_patterns(path):
+    # {"courses": {code: regex, ...}, "questions": {kind: regex, ...}, "roles": {...}}, all optional.
+    # Courses replace the built-in list; questions override the headcount/overall/identify patterns by
+    # kind; roles may set "responses", "headcount_course", "headcount_role" and "headcount_excluded"
+    global COURSE_PATTERNS, QUESTION_PATTERNS, COURSE_CODES, COURSE_CLASSIFIER, QUESTION_CLASSIFIER
+    global ROLE_RESPONSES, HEADCOUNT_COURSE, HEADCOUNT_ROLE, HEADCOUNT_EXCLUDED, ROLES
+    with open(path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    unknown_kinds = set(config.get('questions', {})) - set(QUESTION_PATTERNS)
+    if unknown_kinds:
+        raise ValueError(f'{path}: unknown question kinds {sorted(unknown_kinds)}, '
+                         f'expected some of {list(QUESTION_PATTERNS)}')
+    course_patterns = dict(config.get('courses', COURSE_PATTERNS))
+    roles = config.get('roles', {})
+    role_responses = dict(roles.get('responses', ROLE_RESPONSES))
+    headcount_course = roles.get('headcount_course', HEADCOUNT_COURSE)
+    headcount_excluded = list(roles.get('headcount_excluded', HEADCOUNT_EXCLUDED))
+    if headcount_course not in course_patterns:
+        raise ValueError(f'{path}: headcount course {headcount_course!r} is not one of the courses '
+                         f'{list(course_patterns)}, set "roles": {{"headcount_course": ...}} to the renamed code')
+    unknown_roles = set(headcount_excluded) - set(role_responses.values())
+    if unknown_roles:
+        raise ValueError(f'{path}: unknown excluded roles {sorted(unknown_roles)}, '
+                         f'expected some of {list(role_responses.values())}')
+
+    COURSE_PATTERNS = course_patterns
+    QUESTION_PATTERNS = {**QUESTION_PATTERNS, **config.get('questions', {})}
+    ROLE_RESPONSES = role_responses
+    HEADCOUNT_COURSE = headcount_course
+    HEADCOUNT_ROLE = roles.get('headcount_role', HEADCOUNT_ROLE)
+    HEADCOUNT_EXCLUDED = headcount_excluded
+    ROLES = role_names()
+    COURSE_CODES = list(COURSE_PATTERNS) + [UNKNOWN_COURSE]
+    COURSE_CLASSIFIER = compile_patterns(COURSE_PATTERNS)
+    QUESTION_CLASSIFIER = compile_patterns(QUESTION_PATTERNS)
+    # Worker processes import the module afresh and pick the file up from here
+    os.environ['CRITIQUE_PATTERNS'] = path
+    logger.info(f'Classification patterns loaded from {path}: courses {list(COURSE_PATTERNS)}, roles {ROLES}')
+
+
+if PATTERNS_PATH:
+    configure_patterns(PATTERNS_PATH)
+
+
+def _classify_values(series, classifier, categories):
+    labels = {}
+    for value in series.dropna().unique():
+        text = str(value)
+        labels[value] = next((label for label, pattern in classifier if pattern.search(text)), None)
+    return pd.Categorical(series.map(labels), categories=categories)
+
+
+def classify_critiques(crit, course_patterns=None, question_patterns=None):
+    course_classifier = COURSE_CLASSIFIER if course_patterns is None else compile_patterns(course_patterns)
+    question_classifier = QUESTION_CLASSIFIER if question_patterns is None else compile_patterns(question_patterns)
+    course_labels = [label for label, _ in course_classifier]
+    question_labels = [label for label, _ in question_classifier]
+
+    crit = crit.copy()
+    course_code = _classify_values(crit['curriculum'], course_classifier, course_labels + [UNKNOWN_COURSE])
+    course_code[crit['curriculum'].isna().to_numpy()] = UNKNOWN_COURSE
+    crit['course_code'] = course_code
+    crit['question_kind'] = _classify_values(crit['question'], question_classifier, question_labels)
+
+    # One role per counted row: the crew position answer for aircrew, the headcount question for MX
+    is_headcount_course = crit['course_code'] == HEADCOUNT_COURSE
+    role = crit['responsetext'].map(ROLE_RESPONSES).astype(object)
+    role = role.mask(role.isin(HEADCOUNT_EXCLUDED) & is_headcount_course)
+    role = role.mask(is_headcount_course & (crit['question_kind'] == 'headcount'), HEADCOUNT_ROLE)
+    crit['role'] = pd.Categorical(role, categories=ROLES)
+    return crit
+
+"""
+Aggregates student and course counts from the cleaned critique data for the overview pages
+"""
+def course_count_rows(crit):
+    # Known courses are counted on the headcount question, students without a curriculum on the
+    # overall question
+    unknown = crit['course_code'] == UNKNOWN_COURSE
+    return (~unknown & (crit['question_kind'] == 'headcount')) | (unknown & (crit['question_kind'] == 'overall'))
+
+
+def classified(crit):
+    # Frames classified earlier (e.g. split into courses) keep their columns instead of being re-matched
+    return crit if 'course_code' in crit.columns else classify_critiques(crit)
+
+
+def aggregate_critiques(crit):
+    if 'course_code' not in crit.columns:
+        crit = classify_critiques(crit)
+
+    Totals = pd.DataFrame([crit['role'].value_counts().reindex(ROLES, fill_value=0).to_dict()])
+
+    unknown = crit['course_code'] == UNKNOWN_COURSE
+    course_counts = crit.loc[course_count_rows(crit), 'course_code'].value_counts()
+    Totals_by_Course = pd.DataFrame([course_counts.reindex(crit['course_code'].cat.categories, fill_value=0).to_dict()])
+
+    NoCourse = crit[unknown & (crit['question_kind'] == 'identify')]
+
+    overall_comments = crit[crit['question'] == "Overall, this refresher course was:"]
+    overall_comments_df = pd.DataFrame({
+        'Comments': overall_comments['responsetext'],
+        'Curriculum': overall_comments['curriculum'],
+    })
+    return Totals, Totals_by_Course, NoCourse, overall_comments_df
+
+
+"""
+Per-month breakdown of the Student and Course overview counts for consolidated and store range reports.
+Rows without a responsedate are left out; returns (None, None) when a single month remains.
+"""
+def monthly_breakdown(crit):
+    crit = classified(crit)
+    month = pd.to_datetime(crit['responsedate'], errors='coerce', format='mixed').dt.strftime('%Y-%m')
+    crit, month = crit[month.notna()], month.dropna()
+    if month.nunique() <= 1:
+        return None, None
+
+    monthly_totals = pd.crosstab(month, crit['role']).reindex(columns=ROLES, fill_value=0)
+    counted = course_count_rows(crit)
+    monthly_tbc = pd.crosstab(month[counted], crit.loc[counted, 'course_code'])
+    monthly_tbc = monthly_tbc.reindex(columns=crit['course_code'].cat.categories, fill_value=0)
+    months = sorted(set(monthly_totals.index) | set(monthly_tbc.index))
+    return (monthly_totals.reindex(months, fill_value=0).rename_axis('Month'),
+            monthly_tbc.reindex(months, fill_value=0).rename_axis('Month'))
+
+"""
+Preview for the GUI, the overview counts and per-question score summary without charts or a document
+"""
+def preview_summary(crit):
+    crit = classified(crit)
+    Totals, Totals_by_Course, NoCourse, _ = aggregate_critiques(crit)
+    questions = scored_questions(crit)
+    counts = score_counts(crit[crit['question'].isin(questions)], questions)
+    responses = counts.sum(axis=1)
+    score_total = (counts * [int(score) for score in ALL_SCORES]).sum(axis=1)
+    question_stats = pd.DataFrame({'Responses': responses, 'Mean': score_total / responses.where(responses > 0)})
+    question_stats = pd.concat([question_stats, counts], axis=1)
+    question_stats['Below 3'] = counts[['1', '2']].sum(axis=1)
+    return {'totals': Totals.iloc[0].to_dict(), 'courses': Totals_by_Course.iloc[0].to_dict(),
+            'unknown_entries': len(NoCourse), 'questions': question_stats}
+
+
+def preview_exports(crit_file, progress=None, cancel_event=None, use_cache=True):
+    # ((crit, initial_rows, cleaned_rows), summary); pass the first item to build_report as loaded
+    load_dependencies()
+    paths = [crit_file] if isinstance(crit_file, str) else list(crit_file)
+    with ProgressTracker(progress, cancel_event):
+        loaded = load_exports(paths, use_cache=use_cache)
+        update_progress('Aggregating')
+        return loaded, preview_summary(loaded[0])
+
+"""
+Full pipeline for one or more LMS exports: clean, aggregate, build question tables, and write the Word
+report.  Shared by the GUI and the command line so both produce identical reports.
+"""
+def build_report(crit_file, output_file, progress=None, chart_workers=None, use_cache=True, diagnostics=False,
+                 metrics_path=METRICS_PATH, trace_memory=False, cancel_event=None, data_file=None,
+                 image_quality=DEFAULT_IMAGE_QUALITY, loaded=None):
+    load_dependencies()
+    paths = [crit_file] if isinstance(crit_file, str) else list(crit_file)
+    with RunMetrics('; '.join(paths), path=metrics_path, trace_memory=trace_memory), \
+            ProgressTracker(progress, cancel_event):
+        record_counts(output=output_file)
+        if loaded is None:
+            loaded = load_exports(paths, workers=chart_workers, use_cache=use_cache, diagnostics=diagnostics)
+        crit, initial_rows, cleaned_rows = loaded
+        return report_from_critiques(crit, initial_rows, cleaned_rows, output_file,
+                                     chart_workers=chart_workers, use_cache=use_cache, data_file=data_file,
+                                     image_quality=image_quality, monthly=len(paths) > 1)
+
+
+def load_exports(paths, workers=None, use_cache=True, diagnostics=False):
+    update_progress('Loading export')
+    if len(paths) == 1:
+        return critReport(paths[0], use_cache=use_cache, diagnostics=diagnostics)
+    return consolidate_exports(paths, workers=workers, use_cache=use_cache, diagnostics=diagnostics)
+
+
+def report_from_critiques(crit, initial_rows, cleaned_rows, output_file, chart_workers=None, use_cache=True,
+                          data_file=None, image_quality=DEFAULT_IMAGE_QUALITY, course_code=None, export_rows=None,
+                          monthly=False):
+    load_dependencies()
+    update_progress('Aggregating')
+    with stage('aggregation'):
+        crit = classified(crit)
+        Totals, Totals_by_Course, NoCourse, overall_comments_df = aggregate_critiques(crit)
+        # Only consolidated and store range reports span several months
+        monthly_totals, monthly_tbc = monthly_breakdown(crit) if monthly else (None, None)
+
+    update_progress('Building question tables')
+    # Charts are only needed for the Word report, a data-only run skips Matplotlib entirely
+    scorecards, comments, bars = question_table(crit, chart_workers=chart_workers, use_cache=use_cache,
+                                                charts=output_file is not None, image_quality=image_quality)
+
+    if data_file is not None:
+        export_data(data_file, scorecards, comments, Totals, Totals_by_Course, NoCourse, overall_comments_df,
+                    monthly_totals=monthly_totals, monthly_tbc=monthly_tbc)
+    if output_file is None:
+        update_progress('Saving document', 1, 1)
+        return data_file
+
+    export_to_word(
+        bar_charts=bars,
+        comment_tables=comments,
+        filename=output_file,
+        totals=Totals,
+        tbc=Totals_by_Course,
+        no_course=NoCourse,
+        overall_comments_df=overall_comments_df,
+        initial_rows=initial_rows,
+        cleaned_rows=cleaned_rows,
+        use_cache=use_cache,
+        monthly_totals=monthly_totals,
+        monthly_tbc=monthly_tbc,
+        image_quality=image_quality,
+        section_workers=chart_workers,
+        course_code=course_code,
+        export_rows=export_rows
+    )
+    update_progress('Saving document', 1, 1)
+    return output_file
+
+"""
+Per-course split: the combined report plus one report per course, from a single clean of the exports.
+"""
+def course_output_path(output_file, course_code):
+    stem, ext = os.path.splitext(output_file)
+    return f'{stem}_{course_code}{ext}'
+
+
+def split_by_course(crit):
+    # {None: every response, course code: that course's responses}, courses with no responses skipped
+    crit = classified(crit)
+    subsets = {None: crit}
+    for code in crit['course_code'].cat.categories:
+        rows = crit[crit['course_code'] == code]
+        if code != UNKNOWN_COURSE and len(rows):
+            subsets[code] = rows
+    return subsets
+
+
+def build_course_reports(crit_file, output_file, progress=None, workers=None, use_cache=True, diagnostics=False,
+                         metrics_path=METRICS_PATH, trace_memory=False, cancel_event=None, data_format=None,
+                         word=True, image_quality=DEFAULT_IMAGE_QUALITY, loaded=None):
+    load_dependencies()
+    paths = [crit_file] if isinstance(crit_file, str) else list(crit_file)
+    with RunMetrics('; '.join(paths), path=metrics_path, trace_memory=trace_memory), \
+            ProgressTracker(progress, cancel_event):
+        record_counts(output=output_file)
+        if loaded is None:
+            loaded = load_exports(paths, workers=workers, use_cache=use_cache, diagnostics=diagnostics)
+        crit, initial_rows, cleaned_rows = loaded
+        update_progress('Aggregating')
+        with stage('aggregation'):
+            subsets = split_by_course(crit)
+        jobs = {(output_file if code is None else course_output_path(output_file, code)): (code, rows)
+                for code, rows in subsets.items()}
+        record_counts(reports=len(jobs))
+
+        outputs = {}
+        failures = {}
+        update_progress('Writing report', 0, len(jobs))
+        with stage('course_reports'):
+            pool = ProcessPoolExecutor(max_workers=workers)
+            try:
+                futures = {pool.submit(report_from_critiques, rows,
+                                       initial_rows if code is None else len(rows),
+                                       cleaned_rows if code is None else len(rows),
+                                       path if word else None, chart_workers=1, use_cache=use_cache,
+                                       data_file=data_output_path(path, data_format) if data_format else None,
+                                       image_quality=image_quality, course_code=code,
+                                       export_rows=cleaned_rows, monthly=len(paths) > 1): path
+                           for path, (code, rows) in jobs.items()}
+                for future in as_completed(futures):
+                    path = futures[future]
+                    try:
+                        outputs[path] = future.result()
+                        logger.info(f'Course report complete: {outputs[path]}')
+                    except Exception as e:
+                        failures[path] = e
+                        logger.error(f"❌ Error writing {path}: {e}")
+                    update_progress('Writing report', len(outputs) + len(failures), len(jobs))
+                    check_cancelled()
+            except BaseException:
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+            pool.shutdown()
+        update_progress('Saving document', 1, 1)
+        return [outputs[path] for path in jobs if path in outputs], failures
+
+"""
+Incremental SQLite store of cleaned critiques, keyed by a hash of the dedup columns so overlapping
+exports only add unseen responses; period and date range reports query it by responsedate
+"""
+STORE_PATH = os.environ.get('CRITIQUE_STORE',
+                            os.path.join(os.path.expanduser('~'), '.critique_report', 'critiques.sqlite3'))
+STORE_COLUMNS = ['firstname', 'lastname', 'curriculum', 'question', 'responsetext', 'responsecomments',
+                 'responsedate']
+
+
+def open_store(path=STORE_PATH):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path)
+    columns = ', '.join(f'{col} TEXT' for col in STORE_COLUMNS)
+    conn.execute(f'CREATE TABLE IF NOT EXISTS critiques (dedup_key TEXT PRIMARY KEY, {columns})')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_critiques_responsedate ON critiques (responsedate)')
+    return conn
+
+
+def _store_text(series):
+    return [None if pd.isna(v) else str(v) for v in series]
+
+
+def _store_dates(series):
+    # ISO text sorts chronologically, which is what the date range queries rely on
+    parsed = pd.to_datetime(series, errors='coerce', format='mixed')
+    iso = parsed.dt.strftime('%Y-%m-%d %H:%M:%S')
+    return [None if pd.isna(raw) else (text if pd.notna(text) else str(raw))
+            for raw, text in zip(series, iso)]
+
+
+def ingest_critiques(conn, crit):
+    rows = pd.DataFrame({col: _store_text(crit[col]) if col != 'responsedate' else _store_dates(crit[col])
+                         for col in STORE_COLUMNS})
+    keys = ['\x1f'.join('' if v is None else v for v in values)
+            for values in zip(*(rows[col] for col in DEDUP_COLUMNS))]
+    rows.insert(0, 'dedup_key', [hashlib.md5(key.encode('utf-8')).hexdigest() for key in keys])
+    rows = rows.astype(object).where(rows.notna(), None)
+
+    columns = ['dedup_key'] + STORE_COLUMNS
+    updates = ', '.join(f'{col} = excluded.{col}' for col in STORE_COLUMNS)
+    before = conn.execute('SELECT COUNT(*) FROM critiques').fetchone()[0]
+    with conn:
+        conn.executemany(
+            f'INSERT INTO critiques ({", ".join(columns)}) VALUES ({", ".join("?" * len(columns))}) '
+            f'ON CONFLICT(dedup_key) DO UPDATE SET {updates} '
+            f'WHERE excluded.curriculum > critiques.curriculum '
+            f'OR (critiques.curriculum IS NULL AND excluded.curriculum IS NOT NULL)',
+            rows[columns].itertuples(index=False, name=None))
+    after = conn.execute('SELECT COUNT(*) FROM critiques').fetchone()[0]
+    return after - before, after
+
+
+def ingest_export(crit_file, store_path=STORE_PATH, use_cache=True, diagnostics=False):
+    crit, _, _ = critReport(crit_file, use_cache=use_cache, diagnostics=diagnostics)
+    conn = open_store(store_path)
+    try:
+        inserted, total = ingest_critiques(conn, crit)
+    finally:
+        conn.close()
+    logger.info(f'Ingested {crit_file}: {inserted} new responses, {total} in store.')
+    return inserted, total
+
+
+PERIOD_PATTERN = re.compile(r'^\d{4}-(0?[1-9]|1[0-2]|Q[1-4])$', re.IGNORECASE)
+
+
+def period_bounds(period):
+    # 'YYYY-MM' for a month or 'YYYY-Qn' for a quarter, end date exclusive
+    if not PERIOD_PATTERN.match(period):
+        raise ValueError(f'Invalid period {period!r}, expected YYYY-MM (e.g. 2025-07) or YYYY-Qn (e.g. 2025-Q3)')
+    year, part = period.upper().split('-')
+    if part.startswith('Q'):
+        first_month = (int(part[1:]) - 1) * 3 + 1
+        months = 3
+    else:
+        first_month = int(part)
+        months = 1
+    start = datetime(int(year), first_month, 1)
+    end_month = first_month + months
+    end = datetime(int(year) + (end_month - 1) // 12, (end_month - 1) % 12 + 1, 1)
+    return start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d')
+
+
+def query_store(start=None, end=None, store_path=STORE_PATH):
+    clauses, params = [], []
+    if start:
+        clauses.append('responsedate >= ?')
+        params.append(start)
+    if end:
+        clauses.append('responsedate < ?')
+        params.append(end)
+    where = f' WHERE {" AND ".join(clauses)}' if clauses else ''
+    conn = open_store(store_path)
+    try:
+        return pd.read_sql_query(f'SELECT {", ".join(STORE_COLUMNS)} FROM critiques{where} ORDER BY rowid',
+                                 conn, params=params)
+    finally:
+        conn.close()
+
+
+def build_report_from_store(output_file, start=None, end=None, store_path=STORE_PATH,
+                            chart_workers=None, use_cache=True, metrics_path=METRICS_PATH, trace_memory=False,
+                            data_file=None, image_quality=DEFAULT_IMAGE_QUALITY):
+    load_dependencies()
+    with RunMetrics(f'{store_path} [{start or "start"}, {end or "end"})', path=metrics_path,
+                    trace_memory=trace_memory):
+        record_counts(output=output_file)
+        with stage('store_query'):
+            crit = query_store(start, end, store_path)
+        record_counts(initial_rows=len(crit), cleaned_rows=len(crit))
+        if crit.empty:
+            raise ValueError(f'No stored responses for {start or "start"} to {end or "end"} in {store_path}; '
+                             f'ingest the exports for that period with --ingest first')
+        logger.info(f'Loaded {len(crit)} stored responses for {start or "start"} to {end or "end"}')
+        return report_from_critiques(crit, len(crit), len(crit), output_file,
+                                     chart_workers=chart_workers, use_cache=use_cache, data_file=data_file,
+                                     image_quality=image_quality, monthly=True)
+
+"""
+Headless batch mode, runs one report per input file in a process pool so quarter-end runs
+across every site use all available cores
+"""
+def batch_output_path(crit_file, out_dir):
+    stem = os.path.splitext(os.path.basename(crit_file))[0]
+    return os.path.join(out_dir, f'{stem}_critique_report.docx')
+
+
+def run_batch(inputs, out_dir, workers=None, use_cache=True, diagnostics=False, metrics_path=METRICS_PATH,
+              trace_memory=False, data_format=None, word=True, image_quality=DEFAULT_IMAGE_QUALITY):
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = {crit_file: batch_output_path(crit_file, out_dir) for crit_file in inputs}
+    results = {}
+    failures = {}
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Files are already spread across the pool, so each job renders its charts inline
+        futures = {pool.submit(build_report, crit_file, output_file if word else None,
+                               chart_workers=1, use_cache=use_cache, diagnostics=diagnostics,
+                               metrics_path=metrics_path, trace_memory=trace_memory,
+                               data_file=data_output_path(output_file, data_format) if data_format else None,
+                               image_quality=image_quality):
+                   crit_file
+                   for crit_file, output_file in jobs.items()}
+        for future in as_completed(futures):
+            crit_file = futures[future]
+            try:
+                results[crit_file] = future.result()
+                logger.info(f'Batch report complete: {crit_file} -> {results[crit_file]}')
+            except Exception as e:
+                failures[crit_file] = e
+                logger.error(f"❌ Error processing {crit_file}: {e}")
+
+    return results, failures
+
+"""
+Watch-folder service: a warm worker pool turns each export saved into a drop directory into a report.
+"""
+WATCH_POLL_SECONDS = 2.0
+WATCH_QUEUE_SIZE = 16
+WATCH_EXTENSIONS = ('.xls', '.xlsx')
+WATCH_STOP_FILE = 'STOP'  # the windowed exe has no console to press Ctrl+C in
+
+
+def export_snapshot(watch_dir):
+    # {path: (size, mtime)} for every export in the drop directory, Excel lock files excluded
+    snapshot = {}
+    for entry in os.scandir(watch_dir):
+        if entry.name.lower().endswith(WATCH_EXTENSIONS) and not entry.name.startswith('~$') and entry.is_file():
+            stat = entry.stat()
+            snapshot[entry.path] = (stat.st_size, stat.st_mtime)
+    return snapshot
+
+
+def report_is_current(crit_file, output_file):
+    try:
+        return os.path.getmtime(output_file) >= os.path.getmtime(crit_file)
+    except OSError:
+        return False
+
+
+def _watch_worker_init():
+    # Ctrl+C reaches every process on the console, only the service loop should handle it
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    load_dependencies()
+
+
+def _log_watch_result(future, crit_file):
+    try:
+        logger.info(f'Watch report complete: {crit_file} -> {future.result()}')
+        return True
+    except Exception as e:
+        logger.error(f"❌ Error processing {crit_file}: {e}")
+        return False
+
+
+def watch_folder(watch_dir, out_dir, workers=None, use_cache=True, diagnostics=False, metrics_path=METRICS_PATH,
+                 trace_memory=False, data_format=None, word=True, image_quality=DEFAULT_IMAGE_QUALITY,
+                 poll_interval=WATCH_POLL_SECONDS, queue_size=WATCH_QUEUE_SIZE, stop_event=None):
+    os.makedirs(out_dir, exist_ok=True)
+    stop_event = stop_event or threading.Event()
+    workers = workers or os.cpu_count() or 1
+    stop_file = os.path.join(watch_dir, WATCH_STOP_FILE)
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(stop_file)
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_watch_worker_init)
+    # Start the workers now so the first export does not wait for the imports
+    for future in [pool.submit(load_dependencies) for _ in range(workers)]:
+        future.result()
+    logger.info(f'Watching {watch_dir} for LMS exports with {workers} warm worker(s); reports go to {out_dir}. '
+                f'Create {stop_file} to stop.')
+
+    pending = {}
+    seen = set()
+    previous = {}
+    written = failed = 0
+    try:
+        while not stop_event.is_set():
+            if os.path.exists(stop_file):
+                logger.info(f'Found {stop_file}, finishing {len(pending)} queued report(s) and stopping')
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(stop_file)
+                break
+            for future in [future for future in pending if future.done()]:
+                if _log_watch_result(future, pending.pop(future)):
+                    written += 1
+                else:
+                    failed += 1
+
+            snapshot = export_snapshot(watch_dir)
+            for crit_file, signature in sorted(snapshot.items(), key=lambda item: item[1][1]):
+                if len(pending) >= queue_size:
+                    break
+                if previous.get(crit_file) != signature or (crit_file, signature) in seen:
+                    continue
+                seen.add((crit_file, signature))
+                output_file = batch_output_path(crit_file, out_dir)
+                data_file = data_output_path(output_file, data_format) if data_format else None
+                if report_is_current(crit_file, output_file if word else data_file):
+                    continue
+                future = pool.submit(build_report, crit_file, output_file if word else None, chart_workers=1,
+                                     use_cache=use_cache, diagnostics=diagnostics, metrics_path=metrics_path,
+                                     trace_memory=trace_memory, data_file=data_file, image_quality=image_quality)
+                pending[future] = crit_file
+                logger.info(f'Queued {crit_file}')
+            previous = snapshot
+            stop_event.wait(poll_interval)
+    except KeyboardInterrupt:
+        # Workers ignore SIGINT, so reports already running are finished and logged below
+        abandoned = [future for future in pending if future.cancel()]
+        for future in abandoned:
+            del pending[future]
+        logger.info(f'Watch interrupted, {len(abandoned)} queued report(s) abandoned')
+
+    pool.shutdown()
+    for future, crit_file in pending.items():
+        if _log_watch_result(future, crit_file):
+            written += 1
+        else:
+            failed += 1
+    return written, failed
+
+
+def period_arg(value):
+    try:
+        period_bounds(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    return value
+
+
+def date_arg(value):
+    # ISO or US-style dates, returned as ISO so they compare correctly with the stored responsedate text
+    for fmt in ('%Y-%m-%d', '%m/%d/%Y'):
+        try:
+            return datetime.strptime(value, fmt).strftime('%Y-%m-%d')
+        except ValueError:
+            pass
+    raise argparse.ArgumentTypeError(f'Invalid date {value!r}, expected YYYY-MM-DD (e.g. 2025-06-01) or MM/DD/YYYY')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Generate JMATS critique reports from LMS exports. '
+                                                 'Runs the GUI when no input files are given.')
+    parser.add_argument('--input', nargs='+', metavar='FILE',
+                        help='one or more LMS critique exports (.xls, .xlsx) to process headlessly')
+    parser.add_argument('--consolidate', action='store_true',
+                        help='merge all --input exports into one report (e.g. three months into a quarter)')
+    parser.add_argument('--out-dir', default='reports',
+                        help='directory the Word reports are written to (default: reports)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='number of worker processes (default: one per CPU core)')
+    parser.add_argument('--ingest', nargs='+', metavar='FILE',
+                        help='add LMS exports to the local critique store; only unseen responses are inserted')
+    parser.add_argument('--period', metavar='YYYY-MM|YYYY-Qn', type=period_arg,
+                        help='write a report for a month or quarter from the critique store')
+    parser.add_argument('--start', metavar='YYYY-MM-DD', type=date_arg,
+                        help='write a report from the critique store starting on this date')
+    parser.add_argument('--end', metavar='YYYY-MM-DD', type=date_arg,
+                        help='end date (exclusive) for a report from the critique store')
+    parser.add_argument('--split', action='store_true',
+                        help='write the combined report plus one report per course (PDC, LDC, PSR, LRT, MX) '
+                             'from a single clean of the --input exports')
+    parser.add_argument('--out', metavar='FILE',
+                        help='Word report written by --consolidate, --split or --period/--start/--end '
+                             '(default: in --out-dir)')
+    parser.add_argument('--watch', metavar='DIR',
+                        help='run as a service: watch DIR for new LMS exports and write their reports to --out-dir; '
+                             f'create a file named {WATCH_STOP_FILE} in DIR (or press Ctrl+C) to stop')
+    parser.add_argument('--poll-interval', type=float, default=WATCH_POLL_SECONDS, metavar='SECONDS',
+                        help=f'how often --watch checks for new exports (default: {WATCH_POLL_SECONDS:g})')
+    parser.add_argument('--store', default=STORE_PATH,
+                        help=f'critique store database (default: {STORE_PATH})')
+    parser.add_argument('--measure-startup', action='store_true',
+                        help='open the GUI, log the seconds from launch to window ready to pycritique.log '
+                             '(and print them when run from a console), and exit')
+    parser.add_argument('--data-format', choices=['xlsx', 'csv'],
+                        help='also write the scorecards, totals, comments and no-course entries as data '
+                             '(<report>_data.xlsx, or one <report>_data_<table>.csv per table)')
+    parser.add_argument('--data-only', action='store_true',
+                        help='write only the data export, no Word report (implies --data-format xlsx)')
+    parser.add_argument('--image-quality', choices=list(IMAGE_QUALITIES), default=DEFAULT_IMAGE_QUALITY,
+                        help='chart images in the Word report: draft (smallest), standard, or print '
+                             '(high resolution with vector copies) (default: %(default)s)')
+    parser.add_argument('--patterns', metavar='FILE',
+                        help='JSON file of course and question classification patterns and role rules '
+                             '({"courses": {"PDC": "regex", ...}, "questions": {"headcount": "regex", ...}, '
+                             '"roles": {"headcount_course": "MX", ...}}); '
+                             'also read from the CRITIQUE_PATTERNS environment variable')
+    parser.add_argument('--diagnostics', action='store_true',
+                        help='log duplicate statistics while cleaning (slower on large exports)')
+    parser.add_argument('--metrics', default=METRICS_PATH, metavar='FILE',
+                        help=f'JSON lines file each run appends its timing record to (default: {METRICS_PATH})')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='record per-stage Python heap peaks with tracemalloc (slower)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='ignore the cleaned-data and chart caches; always re-parse exports and re-render charts')
+    return parser.parse_args(argv)
+
+
 """
 Executes file as desirred, CLI for user choice of files, and month selection. Ran by .bat file
 """
-def run_gui():
+def run_gui(measure_startup=False):
     import tkinter.messagebox as messagebox
 
     root = tk.Tk()
     root.title("Critique Report Generator")
-    root.geometry("800x500")
+    root.geometry("800x620")
 
     critique_file_var = tk.StringVar()
     filename_var = tk.StringVar()
+    data_export_var = tk.BooleanVar(value=False)
+    quality_var = tk.StringVar(value=DEFAULT_IMAGE_QUALITY)
+    split_var = tk.BooleanVar(value=False)
 
     # Progress Bar
     pb = ttk.Progressbar(root, orient='horizontal', length=400, mode='determinate', maximum=100)
     pb.pack(pady=10)
+    status_var = tk.StringVar()
+    tk.Label(root, textvariable=status_var).pack()
 
     def browse_critique():
-        filename = filedialog.askopenfilename(
-            title="Select the Critique excel (.xls, .xlsx) file",
+        # Several monthly exports may be selected at once for a consolidated quarterly report
+        filenames = filedialog.askopenfilenames(
+            title="Select the Critique excel (.xls, .xlsx) file(s)",
             filetypes=[("Excel files", "*.xls *.xlsx")]
         )
-        critique_file_var.set(filename)
+        critique_file_var.set('; '.join(filenames))
 
     def browse_save_location():
         file_path = filedialog.asksaveasfilename(
@@ -470,97 +2025,204 @@ def run_gui():
         )
         filename_var.set(file_path)
 
+    # Worker thread -> Tk thread channel; only the Tk thread touches widgets or message boxes
+    events = queue.Queue()
+    cancel_event = threading.Event()
+    # Exports loaded for the last preview, reused by Generate Report while the files on disk are unchanged
+    preview_state = {'signature': None, 'loaded': None}
+    # Generate buttons of open preview windows, disabled with the main one while a task runs
+    preview_buttons = []
+
+    def export_signature(paths):
+        # [(path, size, mtime)] per export, None when one is missing so nothing is reused
+        try:
+            return [(path, os.stat(path).st_size, os.stat(path).st_mtime_ns) for path in paths]
+        except OSError:
+            return None
+
+    def format_eta(eta):
+        if eta is None:
+            return ''
+        minutes, seconds = divmod(int(eta), 60)
+        return f' - about {minutes}m {seconds:02d}s left' if minutes else f' - about {seconds}s left'
+
+    def set_running(running):
+        generate_button.config(state=tk.DISABLED if running else tk.NORMAL)
+        preview_button.config(state=tk.DISABLED if running else tk.NORMAL)
+        cancel_button.config(state=tk.NORMAL if running else tk.DISABLED)
+        preview_buttons[:] = [button for button in preview_buttons if button.winfo_exists()]
+        for button in preview_buttons:
+            button.config(state=tk.DISABLED if running else tk.NORMAL)
+
+    def score_thumbnail(counts, width=60, height=16):
+        # Tiny 1-5 distribution drawn pixel by pixel, no Matplotlib, so a preview of any size is instant
+        image = tk.PhotoImage(width=width, height=height)
+        peak = max(max(counts), 1)
+        bar_width = width // len(counts)
+        for i, (score, count) in enumerate(zip(ALL_SCORES, counts)):
+            bar_height = round(count / peak * height)
+            if bar_height:
+                image.put(SCORE_COLORS[score], to=(i * bar_width + 1, height - bar_height, (i + 1) * bar_width - 1, height))
+        return image
+
+    def show_preview(crit_file, loaded, summary):
+        _, initial_rows, cleaned_rows = loaded
+        window = tk.Toplevel(root)
+        window.title("Report Preview")
+        window.geometry("900x520")
+
+        totals = ', '.join(f'{role}: {count}' for role, count in summary['totals'].items())
+        courses = ', '.join(f'{course}: {count}' for course, count in summary['courses'].items())
+        tk.Label(window, justify=tk.LEFT, anchor='w', text=(
+            f"{len(crit_file)} export(s): {initial_rows} records loaded, {cleaned_rows} after cleaning\n"
+            f"Students - {totals}\n"
+            f"Courses - {courses}\n"
+            f"Unknown course entries: {summary['unknown_entries']}")).pack(fill=tk.X, padx=10, pady=5)
+
+        columns = ['Responses', 'Mean'] + ALL_SCORES + ['Below 3']
+        frame = tk.Frame(window)
+        frame.pack(fill=tk.BOTH, expand=True, padx=10)
+        tree = ttk.Treeview(frame, columns=columns)
+        tree.heading('#0', text='Question')
+        tree.column('#0', width=400)
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=55, anchor=tk.CENTER)
+        tree.tag_configure('low', foreground='red')
+        scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        window.thumbnails = []  # Tk drops images nothing in Python refers to
+        for question, row in summary['questions'].iterrows():
+            counts = [int(row[score]) for score in ALL_SCORES]
+            window.thumbnails.append(score_thumbnail(counts))
+            mean = '' if pd.isna(row['Mean']) else f"{row['Mean']:.2f}"
+            tree.insert('', tk.END, text=question, image=window.thumbnails[-1],
+                        values=[int(row['Responses']), mean] + counts + [int(row['Below 3'])],
+                        tags=('low',) if row['Below 3'] else ())
+
+        def confirm():
+            window.destroy()
+            generate_report()
+
+        buttons = tk.Frame(window)
+        buttons.pack(pady=10)
+        preview_buttons.append(tk.Button(buttons, text="Generate Report", command=confirm))
+        preview_buttons[-1].pack(side=tk.LEFT, padx=5)
+        tk.Button(buttons, text="Close", command=window.destroy).pack(side=tk.LEFT, padx=5)
+
+    def drain_events():
+        try:
+            while True:
+                kind, *payload = events.get_nowait()
+                if kind == 'progress':
+                    percent, message, eta = payload
+                    pb['value'] = percent
+                    status_var.set(f'{message}{format_eta(eta)}')
+                    continue
+                set_running(False)
+                if kind == 'done':
+                    status_var.set('Report complete')
+                    messagebox.showinfo("Success", f"Report successfully generated as:\n{payload[0]}")
+                elif kind == 'preview':
+                    crit_file, signature, loaded, summary = payload
+                    preview_state.update(signature=signature, loaded=loaded)
+                    pb['value'] = 0
+                    status_var.set('Preview ready')
+                    show_preview(crit_file, loaded, summary)
+                elif kind == 'cancelled':
+                    pb['value'] = 0
+                    status_var.set('Cancelled')
+                else:
+                    status_var.set('Failed')
+                    messagebox.showerror("Error", f"An error occurred:\n{payload[0]}")
+        except queue.Empty:
+            pass
+        root.after(100, drain_events)
+
     def generate_report():
+        crit_file = [path.strip() for path in critique_file_var.get().split(';') if path.strip()]
+        output_file = filename_var.get()
+
+        if not crit_file:
+            messagebox.showerror("Missing File", "Please select a critique file.")
+            return
+
+        if not output_file:
+            messagebox.showerror("Missing Output Location", "Please select an output file location.")
+            return
+
+        data_file = data_output_path(output_file, 'xlsx') if data_export_var.get() else None
+        image_quality = quality_var.get()
+        split = split_var.get()
+        signature = export_signature(crit_file)
+        loaded = preview_state['loaded'] if signature and preview_state['signature'] == signature else None
         pb['value'] = 0
-        root.update_idletasks()
+        status_var.set('Starting...')
+        cancel_event.clear()
+        set_running(True)
 
         def task():
+            progress = lambda percent, message, eta: events.put(('progress', percent, message, eta))
             try:
-                crit_file = critique_file_var.get()
-                output_file = filename_var.get()
-
-                if not crit_file:
-                    messagebox.showerror("Missing File", "Please select a critique file.")
-                    return
-
-                if not output_file:
-                    messagebox.showerror("Missing Output Location", "Please select an output file location.")
-                    return
-
-                pb['value'] = 10
-                root.update_idletasks()
-
-                # Process Critique
-                crit, initial_rows, cleaned_rows = critReport(crit_file)
-                pb['value'] = 40
-                root.update_idletasks()
-
-                # Aggregations (same as in your script)
-                students = crit[['firstname', 'lastname', 'responsedate']].drop_duplicates().shape[0]
-                p = crit[crit['responsetext'] == 'Pilot'].shape[0]
-                l = crit[(crit['responsetext'] == 'Loadmaster') & (~crit['curriculum'].str.contains('engine ground', case=False, na=False))].shape[0]
-                mx = crit[crit['curriculum'].str.contains('engine ground', case=False, na=False) &
-                          crit['question'].str.contains('knowledgeable', case=False, na=False)].shape[0]
-
-                PDC = crit[crit['curriculum'].str.contains('pilot block difference.*block 8.1', case=False, na=False) &
-                           crit['question'].str.contains('knowledgeable', case=False, na=False)].shape[0]
-
-                LDC = crit[crit['curriculum'].str.contains('loadmaster.*block 8.1', case=False, na=False) &
-                           crit['question'].str.contains('knowledgeable', case=False, na=False)].shape[0]
-
-                PSR = crit[crit['curriculum'].str.contains('C-130J Pilot Refresher', case=False, na=False) &
-                           crit['question'].str.contains('knowledgeable', case=False, na=False)].shape[0]
-
-                LRT = crit[crit['curriculum'].str.contains('loadmaster refresher', case=False, na=False) &
-                           crit['question'].str.contains('knowledgeable', case=False, na=False)].shape[0]
-
-                MX = crit[crit['curriculum'].str.contains('engine ground', case=False, na=False) &
-                          crit['question'].str.contains('knowledgeable', case=False, na=False)].shape[0]
-
-                UNK = crit[crit['curriculum'].isna() & crit['question'].str.contains('overall', case=False, na=False)].shape[0]
-
-                NoCourse = crit[crit['curriculum'].isna() & crit['question'].str.contains('identify', case=False, na=False)]
-
-                Totals = pd.DataFrame([{'Pilots': p, 'Loadmasters': l, 'MX': mx}])
-                Totals_by_Course = pd.DataFrame([{
-                    'PDC': PDC, 'LDC': LDC, 'PSR': PSR, 'LRT': LRT, 'MX': MX, 'Unknown': UNK
-                }])
-
-                overall_comments = crit[crit['question'] == "Overall, this refresher course was:"]
-
-                pb['value'] = 70
-                root.update_idletasks()
-
-                scorecards, comments, bars = question_table(crit)
+                if split:
+                    _, failures = build_course_reports(crit_file, output_file, progress=progress,
+                                                       cancel_event=cancel_event,
+                                                       data_format='xlsx' if data_file else None,
+                                                       image_quality=image_quality, loaded=loaded)
+                    if failures:
+                        names = ', '.join(os.path.basename(path) for path in failures)
+                        events.put(('error', f'{len(failures)} course report(s) failed: {names}'))
+                        return
+                else:
+                    build_report(crit_file, output_file, progress=progress, cancel_event=cancel_event,
+                                 data_file=data_file, image_quality=image_quality, loaded=loaded)
+                events.put(('done', output_file))
+            except ReportCancelled:
+                logger.info('Report cancelled by user')
+                events.put(('cancelled',))
+            except Exception as e:
+                logger.error(f"❌ Error: {e}")
+                events.put(('error', e))
 
-                export_to_word(
-                    bar_charts=bars,
-                    comment_tables=comments,
-                    filename=output_file,
-                    totals=Totals,
-                    tbc=Totals_by_Course,
-                    no_course=NoCourse,
-                    overall_comments_df=pd.DataFrame({
-                        'Comments': overall_comments['responsetext'],
-                        'Curriculum': overall_comments['curriculum'],
-                    }),
-                    initial_rows=initial_rows,
-                    cleaned_rows=cleaned_rows
-                )
+        threading.Thread(target=task, daemon=True).start()
 
-                pb['value'] = 100
-                root.update_idletasks()
+    def preview_report():
+        crit_file = [path.strip() for path in critique_file_var.get().split(';') if path.strip()]
+        if not crit_file:
+            messagebox.showerror("Missing File", "Please select a critique file.")
+            return
 
-                messagebox.showinfo("Success", f"Report successfully generated as:\n{output_file}")
+        # Taken before loading, so an export replaced while the preview loads is not reused
+        signature = export_signature(crit_file)
+        pb['value'] = 0
+        status_var.set('Loading preview...')
+        cancel_event.clear()
+        set_running(True)
 
+        def task():
+            try:
+                loaded, summary = preview_exports(
+                    crit_file, progress=lambda percent, message, eta: events.put(('progress', percent, message, eta)),
+                    cancel_event=cancel_event)
+                events.put(('preview', crit_file, signature, loaded, summary))
+            except ReportCancelled:
+                logger.info('Preview cancelled by user')
+                events.put(('cancelled',))
             except Exception as e:
                 logger.error(f"❌ Error: {e}")
-                messagebox.showerror("Error", f"An error occurred:\n{e}")
+                events.put(('error', e))
+
+        threading.Thread(target=task, daemon=True).start()
 
-        threading.Thread(target=task).start()
+    def cancel_report():
+        cancel_event.set()
+        status_var.set('Cancelling after the current step...')
 
     # Layout GUI
-    tk.Label(root, text="Critique File (required):").pack(pady=5)
+    tk.Label(root, text="Critique File(s) (required):").pack(pady=5)
     tk.Entry(root, textvariable=critique_file_var, width=60).pack()
     tk.Button(root, text="Browse", command=browse_critique).pack(pady=5)
 
@@ -568,12 +2230,124 @@ def run_gui():
     tk.Entry(root, textvariable=filename_var, width=60).pack()
     tk.Button(root, text="Browse", command=browse_save_location).pack(pady=5)
 
-    tk.Button(root, text="Generate Report", command=generate_report).pack(pady=20)
-
+    tk.Checkbutton(root, text="Also export data workbook (.xlsx) for dashboards",
+                   variable=data_export_var).pack(pady=5)
+    tk.Checkbutton(root, text="Also write one report per course (PDC, LDC, PSR, LRT, MX)",
+                   variable=split_var).pack()
+
+    tk.Label(root, text="Chart Quality:").pack()
+    ttk.Combobox(root, textvariable=quality_var, values=list(IMAGE_QUALITIES), state='readonly', width=12).pack()
+
+    preview_button = tk.Button(root, text="Preview", command=preview_report)
+    preview_button.pack(pady=(20, 5))
+    generate_button = tk.Button(root, text="Generate Report", command=generate_report)
+    generate_button.pack(pady=5)
+    cancel_button = tk.Button(root, text="Cancel", command=cancel_report, state=tk.DISABLED)
+    cancel_button.pack()
+
+    def window_ready():
+        elapsed = time.perf_counter() - _START_TIME
+        # Logged to pycritique.log, the windowed exe has no stdout to print to
+        logger.info(f'Window ready {elapsed:.3f}s after startup')
+        if measure_startup:
+            if sys.stdout is not None:
+                print(f'{elapsed:.3f}')
+            root.destroy()
+            return
+        # Load pandas/Matplotlib/python-docx while the user is choosing files
+        threading.Thread(target=load_dependencies, daemon=True).start()
+
+    root.after_idle(window_ready)
+    root.after(100, drain_events)
     root.mainloop()
 
 
 
+def main(argv=None):
+    args = parse_args(argv)
+    if args.patterns:
+        try:
+            configure_patterns(args.patterns)
+        except ValueError as e:
+            logger.error(f"❌ {e}")
+            return 1
+    use_cache = not args.no_cache
+    data_format = args.data_format or ('xlsx' if args.data_only else None)
+
+    def output_files(output_file):
+        # (Word report or None, data export or None) for one report
+        data_file = data_output_path(output_file, data_format) if data_format else None
+        return (None if args.data_only else output_file), data_file
+
+    from_store = args.period or args.start or args.end
+
+    if args.ingest:
+        load_dependencies()
+        for crit_file in args.ingest:
+            ingest_export(crit_file, store_path=args.store, use_cache=use_cache, diagnostics=args.diagnostics)
+
+    if from_store:
+        start, end = period_bounds(args.period) if args.period else (args.start, args.end)
+        if start and end and start >= end:
+            logger.error(f"❌ --start {start} must be before --end {end}")
+            return 1
+        label = args.period or f'{start or "start"}_to_{end or "end"}'
+        output_file = args.out or os.path.join(args.out_dir, f'critique_report_{label}.docx')
+        os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+        output_file, data_file = output_files(output_file)
+        try:
+            build_report_from_store(output_file, start, end, store_path=args.store, use_cache=use_cache,
+                                    metrics_path=args.metrics, trace_memory=args.trace_memory, data_file=data_file,
+                                    image_quality=args.image_quality)
+        except ValueError as e:
+            logger.error(f"❌ {e}")
+            return 1
+
+    if args.ingest or from_store:
+        return 0
+
+    if args.watch:
+        written, failed = watch_folder(args.watch, args.out_dir, workers=args.workers, use_cache=use_cache,
+                                       diagnostics=args.diagnostics, metrics_path=args.metrics,
+                                       trace_memory=args.trace_memory, data_format=data_format,
+                                       word=not args.data_only, image_quality=args.image_quality,
+                                       poll_interval=args.poll_interval)
+        logger.info(f'Watch finished: {written} report(s) written, {failed} failed.')
+        return 1 if failed else 0
+
+    if not args.input:
+        run_gui(measure_startup=args.measure_startup)
+        return 0
+
+    if args.split:
+        output_file = args.out or os.path.join(args.out_dir, 'critique_report.docx')
+        os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+        outputs, failures = build_course_reports(args.input, output_file, workers=args.workers,
+                                                 use_cache=use_cache, diagnostics=args.diagnostics,
+                                                 metrics_path=args.metrics, trace_memory=args.trace_memory,
+                                                 data_format=data_format, word=not args.data_only,
+                                                 image_quality=args.image_quality)
+        logger.info(f'Split finished: {len(outputs)} report(s) written, {len(failures)} failed.')
+        return 1 if failures else 0
+
+    if args.consolidate:
+        output_file = args.out or os.path.join(args.out_dir, 'consolidated_critique_report.docx')
+        os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+        output_file, data_file = output_files(output_file)
+        build_report(args.input, output_file, chart_workers=args.workers, use_cache=use_cache,
+                     diagnostics=args.diagnostics, metrics_path=args.metrics, trace_memory=args.trace_memory,
+                     data_file=data_file, image_quality=args.image_quality)
+        return 0
+
+    results, failures = run_batch(args.input, args.out_dir, workers=args.workers, use_cache=use_cache,
+                                  diagnostics=args.diagnostics, metrics_path=args.metrics,
+                                  trace_memory=args.trace_memory, data_format=data_format,
+                                  word=not args.data_only, image_quality=args.image_quality)
+    logger.info(f'Batch finished: {len(results)} report(s) written, {len(failures)} failed.')
+    return 1 if failures else 0
+
+
 if __name__ == "__main__":
-    run_gui()
+    multiprocessing.freeze_support()
+    sys.exit(main())
 
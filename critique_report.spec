@@ -11,7 +11,7 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=['plotly'],  # unused; keeps the bundle and cold start lean
     noarchive=False,
     optimize=0,
 )